@@ -0,0 +1,121 @@
+"""
+Chessteg Benchmark Module
+Misst die Knotenrate der vollständigen Zugausführung (make_move, GUI)
+gegenüber der Such-Zugausführung (make_search_move) sowie die Knoten
+der Alpha-Beta-Suche je Iterationstiefe
+
+Aufruf:  python engine/benchmark.py [Tiefe]
+         python engine/benchmark.py --suche [Tiefe]
+"""
+
+import sys
+import os
+import io
+import time
+import contextlib
+from typing import Dict, Any
+
+sys.path.append(os.path.dirname(__file__))
+
+from core import ChesstegEngine
+
+# Testpositionen (FEN)
+BENCHMARK_POSITIONS: Dict[str, str] = {
+    'startpos': "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    'italienisch': "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/2P2N2/PP1P1PPP/RNBQK2R w KQkq - 1 5",
+    'damengambit': "rnbqk2r/ppp1bppp/4pn2/3p2B1/2PP4/2N5/PP2PPPP/R2QKBNR w KQkq - 4 5",
+}
+
+
+def walk(engine: ChesstegEngine, depth: int, make, undo) -> int:
+    """
+    Durchläuft den vollständigen Zugbaum bis `depth` mit der angegebenen
+    Zugausführung und zählt die Knoten (wie die Suche ohne Abschneiden).
+    """
+    if depth == 0:
+        return 1
+    nodes = 1
+    color = 1 if engine.white_turn else -1
+    for move in engine.move_generator.generate_packed_moves(color):
+        if make(move):
+            nodes += walk(engine, depth - 1, make, undo)
+            undo()
+    return nodes
+
+
+def run_benchmark(depth: int = 2) -> Dict[str, Dict[str, float]]:
+    """
+    Misst beide Zugausführungen über alle BENCHMARK_POSITIONS.
+
+    Returns:
+        {'make_move': {...}, 'make_search_move': {...}} mit nodes, seconds, nps
+    """
+    engine = ChesstegEngine()
+    modes = {
+        'make_move': (engine.make_move, engine.undo_move),
+        'make_search_move': (engine.make_search_move, engine.undo_search_move),
+    }
+    results = {}
+    for name, (make, undo) in modes.items():
+        nodes = 0
+        seconds = 0.0
+        for fen in BENCHMARK_POSITIONS.values():
+            engine.load_fen(fen)
+            start = time.perf_counter()
+            nodes += walk(engine, depth, make, undo)
+            seconds += time.perf_counter() - start
+        results[name] = {
+            'nodes': nodes,
+            'seconds': seconds,
+            'nps': nodes / seconds if seconds > 0 else 0.0,
+        }
+    return results
+
+
+def run_search_benchmark(depth: int = 4) -> Dict[str, Dict[str, Any]]:
+    """
+    Sucht jede BENCHMARK_POSITION mit fester Tiefe (ohne Timeout) und einer
+    frischen Engine.
+
+    Returns:
+        {Name: {'move', 'depth_nodes': [(Tiefe, Knoten), ...], 'seconds'}}
+    """
+    results = {}
+    for name, fen in BENCHMARK_POSITIONS.items():
+        engine = ChesstegEngine()
+        engine.load_fen(fen)
+        search = engine.search_algorithm
+        search.ai_settings['search_depth'] = depth
+        search.ai_settings['timeout_ms'] = 0
+        start = time.perf_counter()
+        # Die Suche protokolliert ausführlich - hier nur das Ergebnis
+        with contextlib.redirect_stdout(io.StringIO()):
+            move = search.computer_move()
+        results[name] = {
+            'move': search._move_to_notation(move) if move else None,
+            'depth_nodes': list(search.depth_nodes),
+            'seconds': time.perf_counter() - start,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    if '--suche' in sys.argv:
+        args = [arg for arg in sys.argv[1:] if arg != '--suche']
+        depth = int(args[0]) if args else 4
+        total = 0
+        for name, result in run_search_benchmark(depth).items():
+            nodes = ', '.join(f"T{d}: {n}" for d, n in result['depth_nodes'])
+            total += result['depth_nodes'][-1][1] if result['depth_nodes'] else 0
+            print(f"{name:12s} {result['move']}  {nodes}  ({result['seconds']:.2f}s)")
+        print(f"Knoten gesamt: {total}")
+        sys.exit(0)
+
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    results = run_benchmark(depth)
+    for name, result in results.items():
+        print(f"{name:18s} Tiefe {depth}: {result['nodes']:8d} Knoten "
+              f"in {result['seconds']:6.2f}s = {result['nps']:8.0f} Knoten/s")
+    full, fast = results['make_move']['nps'], results['make_search_move']['nps']
+    if full > 0:
+        print(f"Faktor: {fast / full:.1f}x")
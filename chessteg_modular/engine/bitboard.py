@@ -0,0 +1,181 @@
+"""
+Chessteg Bitboard Module
+Optionale Bitboard-Darstellung (Python-Integer, 64 Bit) parallel zum 10x12 Board
+
+Bit-Nummerierung: a1 = 0, b1 = 1, ..., h1 = 7, a2 = 8, ..., h8 = 63
+"""
+
+from typing import Dict, List
+
+PAWN = 1
+KNIGHT = 4
+BISHOP = 3
+ROOK = 5
+QUEEN = 9
+KING = 99
+WHITE = 1
+BLACK = -1
+
+# =============================================================================
+# FELD-UMRECHNUNG 10x12 <-> 0-63
+# =============================================================================
+SQ64: List[int] = [-1] * 120   # 10x12-Feld -> Bit-Index (-1 für Randfelder)
+SQ120: List[int] = [0] * 64    # Bit-Index -> 10x12-Feld
+for _row in range(2, 10):
+    for _col in range(1, 9):
+        _pos = _row * 10 + _col
+        _sq = (_row - 2) * 8 + (_col - 1)
+        SQ64[_pos] = _sq
+        SQ120[_sq] = _pos
+
+FILE_MASKS: List[int] = [sum(1 << (rank * 8 + file) for rank in range(8)) for file in range(8)]
+RANK_MASKS: List[int] = [0xFF << (rank * 8) for rank in range(8)]
+ALL_SQUARES = (1 << 64) - 1
+
+
+def _targets(pos: int, offsets) -> int:
+    """Bitmaske aller gültigen Zielfelder (10x12-Offsets, ein Schritt)."""
+    mask = 0
+    for offset in offsets:
+        target = pos + offset
+        if 0 <= target < 120 and SQ64[target] >= 0:
+            mask |= 1 << SQ64[target]
+    return mask
+
+
+def _ray(pos: int, offset: int) -> int:
+    """Bitmaske eines Strahls ab (ausschließlich) pos in Richtung offset."""
+    mask = 0
+    target = pos + offset
+    while 0 <= target < 120 and SQ64[target] >= 0:
+        mask |= 1 << SQ64[target]
+        target += offset
+    return mask
+
+
+# =============================================================================
+# ANGRIFFSTABELLEN (bei Import vorberechnet)
+# =============================================================================
+KNIGHT_ATTACKS: List[int] = [_targets(SQ120[sq], (21, 19, 12, 8, -8, -12, -19, -21)) for sq in range(64)]
+KING_ATTACKS: List[int] = [_targets(SQ120[sq], (10, -10, 1, -1, 11, 9, -9, -11)) for sq in range(64)]
+PAWN_ATTACKS: Dict[int, List[int]] = {
+    WHITE: [_targets(SQ120[sq], (11, 9)) for sq in range(64)],
+    BLACK: [_targets(SQ120[sq], (-11, -9)) for sq in range(64)],
+}
+
+# Strahlen: Richtungen mit steigendem Bit-Index (erster Blocker = niedrigstes Bit)
+# und mit fallendem Bit-Index (erster Blocker = höchstes Bit)
+POSITIVE_ROOK_RAYS = [[_ray(SQ120[sq], d) for sq in range(64)] for d in (10, 1)]
+NEGATIVE_ROOK_RAYS = [[_ray(SQ120[sq], d) for sq in range(64)] for d in (-10, -1)]
+POSITIVE_BISHOP_RAYS = [[_ray(SQ120[sq], d) for sq in range(64)] for d in (11, 9)]
+NEGATIVE_BISHOP_RAYS = [[_ray(SQ120[sq], d) for sq in range(64)] for d in (-11, -9)]
+
+
+def popcount(mask: int) -> int:
+    """Anzahl gesetzter Bits."""
+    return mask.bit_count()
+
+
+def iter_bits(mask: int):
+    """Liefert die Bit-Indizes aller gesetzten Bits (aufsteigend)."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _slider_attacks(sq: int, occupied: int, positive_rays, negative_rays) -> int:
+    attacks = 0
+    for rays in positive_rays:
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in negative_rays:
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(sq: int, occupied: int) -> int:
+    """Turm-Angriffe von sq bei gegebener Belegung."""
+    return _slider_attacks(sq, occupied, POSITIVE_ROOK_RAYS, NEGATIVE_ROOK_RAYS)
+
+
+def bishop_attacks(sq: int, occupied: int) -> int:
+    """Läufer-Angriffe von sq bei gegebener Belegung."""
+    return _slider_attacks(sq, occupied, POSITIVE_BISHOP_RAYS, NEGATIVE_BISHOP_RAYS)
+
+
+def queen_attacks(sq: int, occupied: int) -> int:
+    """Damen-Angriffe von sq bei gegebener Belegung."""
+    return rook_attacks(sq, occupied) | bishop_attacks(sq, occupied)
+
+
+# =============================================================================
+# BITBOARD-ZUSTAND
+# =============================================================================
+
+class Bitboards:
+    """
+    Ein Bitboard pro Figurenwert (z.B. 1 = weiße Bauern, -5 = schwarze Türme)
+    plus Belegung je Farbe. Wird von ChesstegEngine synchron zum 10x12 Board
+    gehalten.
+    """
+
+    def __init__(self):
+        self.pieces: Dict[int, int] = {}
+        self.occupied: Dict[int, int] = {}
+        self.clear()
+
+    def clear(self):
+        for piece_type in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            self.pieces[piece_type] = 0
+            self.pieces[-piece_type] = 0
+        self.occupied[WHITE] = 0
+        self.occupied[BLACK] = 0
+
+    def rebuild(self, square_index):
+        """Baut alle Bitboards aus dem Feld-Index der Engine neu auf."""
+        self.clear()
+        for position, piece in enumerate(square_index):
+            if piece is not None:
+                self.add(piece.value, position)
+
+    @property
+    def all(self) -> int:
+        return self.occupied[WHITE] | self.occupied[BLACK]
+
+    def add(self, value: int, position: int):
+        bit = 1 << SQ64[position]
+        self.pieces[value] |= bit
+        self.occupied[WHITE if value > 0 else BLACK] |= bit
+
+    def remove(self, value: int, position: int):
+        bit = ~(1 << SQ64[position])
+        self.pieces[value] &= bit
+        self.occupied[WHITE if value > 0 else BLACK] &= bit
+
+    # -------------------------------------------------------------------------
+    # Angriffe
+    # -------------------------------------------------------------------------
+
+    def attacks_from(self, value: int, sq: int) -> int:
+        """Angriffsmaske einer Figur (Figurenwert) auf Bit-Index sq."""
+        piece_type = abs(value)
+        if piece_type == PAWN:
+            return PAWN_ATTACKS[WHITE if value > 0 else BLACK][sq]
+        if piece_type == KNIGHT:
+            return KNIGHT_ATTACKS[sq]
+        if piece_type == KING:
+            return KING_ATTACKS[sq]
+        occupied = self.occupied[WHITE] | self.occupied[BLACK]
+        if piece_type == ROOK:
+            return rook_attacks(sq, occupied)
+        if piece_type == BISHOP:
+            return bishop_attacks(sq, occupied)
+        return queen_attacks(sq, occupied)
@@ -5,7 +5,8 @@ Chessteg Core Engine Module - KORRIGIERTE VERSION (Behebt IndexError)
 import copy
 import sys
 import os
-from typing import List, Dict, Any, Optional
+from collections import namedtuple
+from typing import List, Dict, Any, Optional, Tuple
 
 # Füge den aktuellen Pfad zum Python-Pfad hinzu für relative Imports
 sys.path.append(os.path.dirname(__file__))
@@ -41,6 +42,80 @@ PIECE_SYMBOLS = {
     EMPTY: ' '
 }
 
+# Leeres 10x12 Board mit DUMMY-Rändern (Vorlage für initialize_board)
+EMPTY_BOARD = [DUMMY if not (2 <= i // 10 <= 9 and 1 <= i % 10 <= 8) else EMPTY
+               for i in range(120)]
+
+# FEN-Buchstaben (Kleinbuchstaben) <-> Figurentyp
+FEN_PIECE_TYPES = {'p': PAWN, 'n': KNIGHT, 'b': BISHOP, 'r': ROOK, 'q': QUEEN, 'k': KING}
+FEN_PIECE_LETTERS = {piece_type: letter for letter, piece_type in FEN_PIECE_TYPES.items()}
+FEN_CASTLING = (('K', 'white_kingside'), ('Q', 'white_queenside'),
+                ('k', 'black_kingside'), ('q', 'black_queenside'))
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+class Piece:
+    """
+    Schachfigur mit festen Attributen (__slots__) statt eines Diktionärs.
+
+    Der Zugriff im Engine-Inneren erfolgt über Attribute (`piece.position`).
+    Für GUI und Regeln bleibt der bisherige Diktionär-Zugriff
+    (`piece['position']`, `piece.get('captured', False)`) erhalten.
+    """
+
+    __slots__ = ('id', 'type', 'color', 'value', 'position', 'captured', 'has_moved', 'symbol')
+
+    def __init__(self, piece_id: int, piece_type: int, color: int, position: int):
+        self.id = piece_id
+        self.type = piece_type
+        self.color = color
+        self.value = piece_type * color
+        self.position = position
+        self.captured = False
+        self.has_moved = False
+        self.symbol = PIECE_SYMBOLS.get(self.value, '?')
+
+    # Kompatibilitätsschicht zum bisherigen Diktionär-Format
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self):
+        return self.__slots__
+
+    def __repr__(self) -> str:
+        state = 'x' if self.captured else self.position
+        return f"Piece(id={self.id}, value={self.value}, position={state})"
+
+
+# Kompakter Undo-Eintrag: speichert nur, was ein Zug verändert
+UndoRecord = namedtuple('UndoRecord', [
+    'piece', 'from_pos', 'to_pos', 'captured', 'capture_pos', 'promoted',
+    'has_moved', 'rook', 'rook_from', 'rook_to', 'rook_has_moved',
+    'en_passant_target', 'castling_rights', 'checkmate', 'stalemate', 'hash_key',
+    'halfmove_clock'
+])
+
+from move_encoding import (move_from, move_from_dict, SQUARE_MASK, TO_SHIFT, PROMOTION_SHIFT,
+                           PROMOTION_MASK, PROMOTION_TYPES, FLAG_CASTLING, FLAG_EN_PASSANT,
+                           CASTLING_ROOK_SQUARES)
+from bitboard import Bitboards
+from position_codec import pack_position, unpack_position
+from zobrist import PIECE_KEYS, SIDE_KEY, CASTLING_KEYS, castling_hash, en_passant_hash
+from perft import run_perft
+
 # Import der Komponenten (relative Imports in einer echten Modulstruktur)
 try:
     from move_generation import MoveGenerator
@@ -67,14 +142,49 @@ class ChesstegEngine:
     Schnittstellen zu den modularen Komponenten (Züge, Bewertung, Suche, Regeln).
     """
 
-    def __init__(self):
+    def __init__(self, use_bitboards: bool = False, position: Optional[bytes] = None):
+        """
+        Args:
+            use_bitboards: Führt zusätzlich zum 10x12 Board Bitboards mit und
+                           verwendet sie für Zuggenerierung und Angriffserkennung
+            position: Kodierte Stellung (encode_position) statt der Grundstellung
+        """
         self.board = [EMPTY] * 120 # 10x12 Array, die Ränder sind DUMMY
-        self.pieces: List[Dict[str, Any]] = []
+        self.pieces: List[Piece] = []
         self.white_turn = True
         self.checkmate = False
         self.stalemate = False
         self.next_piece_id = 1 # Eindeutige ID für jede Figur
-        self.move_history: List[Dict[str, Any]] = [] # Speichert vergangene Zustände
+        self.halfmove_clock = 0 # Halbzüge seit letztem Bauernzug oder Schlag (50-Züge-Regel)
+        self.fullmove_number = 1 # Zugnummer, steigt nach jedem Zug von Schwarz
+        self.move_history: List[UndoRecord] = [] # Undo-Einträge der ausgeführten Züge
+        self.null_move_history: List[Tuple[Optional[int], int]] = [] # (en Passant Ziel, Hash) je Nullzug
+
+        # Figuren-Index für O(1)-Zugriffe (wird mit dem Board synchron gehalten)
+        self.square_index: List[Optional[Piece]] = [None] * 120 # Feld -> Figur
+        self.piece_index: Dict[int, Piece] = {} # ID -> Figur
+        self.king_index: Dict[int, Optional[Piece]] = {WHITE: None, BLACK: None}
+        # Figurenlisten je Farbe und Typ, enthalten nur Figuren auf dem Brett
+        self.piece_lists: Dict[int, Dict[int, List[Piece]]] = self._empty_piece_lists()
+
+        # 64-Bit Zobrist-Schlüssel der aktuellen Stellung (inkrementell gepflegt)
+        self.hash_key = 0
+
+        # Legale Züge der aktuellen Stellung: Farbe -> Startfeld -> Zug-Diktionäre
+        # (GUI-Klicks, Statusanzeige, Spielende-Prüfung). Gilt nur für die
+        # Stellung mit dem Hash-Schlüssel _legal_move_cache_key und wird bei
+        # jeder Änderung der Spielstellung verworfen.
+        self._legal_move_cache: Dict[int, Dict[int, List[Dict[str, Any]]]] = {}
+        self._legal_move_cache_key: Optional[int] = None
+        # Anzahl der ausgeführten Such- und Nullzüge (Suche, Perft); solange
+        # sie > 0 ist, wird der Zug-Cache weder gelesen noch gefüllt
+        self._search_ply = 0
+
+        # Fehlersuche: nach jedem make_move/undo_move check_board_consistency ausführen
+        self.debug_consistency = False
+
+        # Optionales Bitboard-Backend (None = nur 10x12 Mailbox)
+        self.bitboards: Optional[Bitboards] = Bitboards() if use_bitboards else None
 
         # Komponenten initialisieren
         self.move_generator = MoveGenerator(self)
@@ -83,8 +193,10 @@ class ChesstegEngine:
         self.rules = ChessRules(self) # Regeln müssen vor initialize_pieces initialisiert werden
 
         self.initialize_board()
-        self.initialize_pieces()
-        self.synchronize_board_state()
+        if position is not None:
+            self.decode_position(position)
+        else:
+            self.initialize_pieces()
         
     # =========================================================================
     # ZUSTANDSVERWALTUNG
@@ -92,25 +204,13 @@ class ChesstegEngine:
 
     def initialize_board(self):
         """Setzt das 120-Felder-Board (10x12) mit DUMMY-Rändern auf."""
-        # Alle Felder auf EMPTY setzen
-        self.board = [EMPTY] * 120 # Indices 0 bis 119
-
-        # KORREKTUR: Ränder setzen
-        # 1. Unterer und oberer vollständiger Rand (Rows 0 und 11, jeweils 10 Felder)
-        for i in range(10): # i von 0 bis 9 (10 Iterationen)
-            # Row 0 (Indices 0 bis 9)
-            self.board[i] = DUMMY
-            # Row 11 (Indices 110 bis 119)
-            self.board[110 + i] = DUMMY
-            
-        # 2. Linke und rechte Ränder (Spalten 0 und 9) für Rows 1 bis 10
-        for i in range(1, 11): # i von 1 bis 10 (10 Iterationen)
-            self.board[i * 10] = DUMMY      # Col 0 (z.B. 10, 20, ..., 100)
-            self.board[i * 10 + 9] = DUMMY  # Col 9 (z.B. 19, 29, ..., 109)
+        # Ränder (Rows 0/1 und 10/11, Spalten 0 und 9) stehen bereits in der Vorlage
+        self.board = EMPTY_BOARD.copy()
             
     def initialize_pieces(self):
         """Setzt die Figuren auf die Standard-Anfangsstellung."""
         self.pieces.clear()
+        self.piece_index.clear()
         self.next_piece_id = 1
         
         # Initialisierung der Regeln (für Castling Rights etc.)
@@ -143,70 +243,248 @@ class ChesstegEngine:
         self.white_turn = True
         self.checkmate = False
         self.stalemate = False
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
         self.move_history.clear()
+        self.null_move_history.clear()
+        self._search_ply = 0
         
         self.synchronize_board_state()
 
     def _add_piece(self, piece_type: int, color: int, position: int):
         """Fügt dem Figuren-Array eine neue Figur hinzu."""
-        piece_value = piece_type * color
-        symbol_key = piece_value 
-        
-        new_piece = {
-            'id': self.next_piece_id,
-            'type': piece_type,
-            'color': color,
-            'value': piece_value,
-            'position': position,
-            'captured': False,
-            'has_moved': False, 
-            'symbol': PIECE_SYMBOLS.get(symbol_key, '?')
-        }
+        new_piece = Piece(self.next_piece_id, piece_type, color, position)
         self.pieces.append(new_piece)
+        self.piece_index[new_piece.id] = new_piece
         self.next_piece_id += 1
 
     def synchronize_board_state(self, silent=False):
         """
         Stellt sicher, dass das 120-Felder-Board den aktuellen Positionen
         im `pieces` Array entspricht.
+
+        Vollständiger Neuaufbau - wird nur beim Aufbau einer neuen Stellung
+        und zur Fehlersuche benötigt. Züge und Editor-Änderungen pflegen
+        Board, Indizes, Bitboards und Schlüssel inkrementell
+        (siehe check_board_consistency).
         """
         # 1. Board resetten (ohne DUMMY-Felder zu überschreiben)
         self.initialize_board()
 
         # 2. Figuren positionieren
         for piece in self.pieces:
-            if not piece['captured']:
-                position = piece['position']
-                piece_value = piece['value']
+            if not piece.captured:
+                position = piece.position
+                piece_value = piece.value
                 
                 if self.is_valid_position(position):
                     self.board[position] = piece_value
                 else:
                     if not silent:
-                        print(f"WARNUNG: Figur ID {piece['id']} an ungültiger Position {position}")
-                    piece['captured'] = True 
+                        print(f"WARNUNG: Figur ID {piece.id} an ungültiger Position {position}")
+                    piece.captured = True 
+
+        # 3. Figuren-Index und Stellungsschlüssel neu aufbauen
+        self._rebuild_piece_index()
+        self.hash_key = self.compute_hash_key()
+        self.invalidate_move_cache()
+
+    def _rebuild_piece_index(self):
+        """
+        Baut die Indizes Feld -> Figur, ID -> Figur, Farbe -> König und die
+        Figurenlisten aus dem `pieces` Array neu auf.
+        """
+        square_index = [None] * 120
+        king_index = {WHITE: None, BLACK: None}
+        piece_index = {}
+        piece_lists = self._empty_piece_lists()
+
+        for piece in self.pieces:
+            piece_index[piece.id] = piece
+            if piece.captured:
+                continue
+            position = piece.position
+            # Bei Doppelbelegung (Editor) gewinnt - wie bisher - die erste Figur
+            if square_index[position] is not None:
+                continue
+            square_index[position] = piece
+            piece_lists[piece.color][piece.type].append(piece)
+            if piece.type == KING and king_index[piece.color] is None:
+                king_index[piece.color] = piece
+
+        self.square_index = square_index
+        self.king_index = king_index
+        self.piece_index = piece_index
+        self.piece_lists = piece_lists
+        if self.bitboards is not None:
+            self.bitboards.rebuild(square_index)
+
+    def check_board_consistency(self) -> List[str]:
+        """
+        Vergleicht die inkrementell gepflegten Strukturen (Board, Feld-Index,
+        Figurenlisten, König-Index, Bitboards, Zobrist-Schlüssel) mit einem
+        Neuaufbau aus dem `pieces` Array, ohne den Zustand zu verändern.
+
+        Returns:
+            Liste der gefundenen Abweichungen (leer = konsistent)
+        """
+        problems = []
+        expected_board = EMPTY_BOARD.copy()
+        expected_index: List[Optional[Piece]] = [None] * 120
+        for piece in self.pieces:
+            if piece.captured:
+                continue
+            position = piece.position
+            if not self.is_valid_position(position):
+                problems.append(f"Figur ID {piece.id} an ungültiger Position {position}")
+            elif expected_index[position] is not None:
+                problems.append(f"Feld {self._position_to_notation(position)} doppelt belegt "
+                                f"(IDs {expected_index[position].id}, {piece.id})")
+            else:
+                expected_index[position] = piece
+                expected_board[position] = piece.value
+
+        for position in range(120):
+            if self.board[position] != expected_board[position]:
+                problems.append(f"board[{position}] = {self.board[position]}, "
+                                f"erwartet {expected_board[position]}")
+            if self.square_index[position] is not expected_index[position]:
+                problems.append(f"square_index[{position}] = {self.square_index[position]!r}, "
+                                f"erwartet {expected_index[position]!r}")
+
+        for color in (WHITE, BLACK):
+            for piece_type, pieces in self.piece_lists[color].items():
+                actual = sorted(piece.id for piece in pieces)
+                expected = sorted(piece.id for piece in expected_index
+                                  if piece is not None and piece.color == color
+                                  and piece.type == piece_type)
+                if actual != expected:
+                    problems.append(f"piece_lists[{color}][{piece_type}] = {actual}, erwartet {expected}")
+            king = self.king_index[color]
+            if king is not None and expected_index[king.position] is not king:
+                problems.append(f"king_index[{color}] zeigt auf {king!r}")
+            elif king is None and self.piece_lists[color][KING]:
+                problems.append(f"king_index[{color}] fehlt")
+
+        if self.bitboards is not None:
+            expected_bitboards = Bitboards()
+            expected_bitboards.rebuild(expected_index)
+            if (self.bitboards.pieces != expected_bitboards.pieces or
+                    self.bitboards.occupied != expected_bitboards.occupied):
+                problems.append("Bitboards weichen vom Board ab")
+
+        if self.hash_key != self.compute_hash_key():
+            problems.append(f"hash_key {self.hash_key:016x} weicht ab, "
+                            f"erwartet {self.compute_hash_key():016x}")
+        return problems
+
+    def _report_inconsistencies(self, context: str):
+        """Gibt die Abweichungen von check_board_consistency aus (Fehlersuche)."""
+        for problem in self.check_board_consistency():
+            print(f"⚠️ INKONSISTENZ nach {context}: {problem}")
+
+    @staticmethod
+    def _empty_piece_lists() -> Dict[int, Dict[int, List[Piece]]]:
+        return {color: {piece_type: [] for piece_type in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING)}
+                for color in (WHITE, BLACK)}
+
+    def compute_hash_key(self) -> int:
+        """
+        Berechnet den Zobrist-Schlüssel der Stellung von Grund auf.
+        Dient zur Initialisierung und zur Überprüfung von `hash_key`.
+        """
+        key = 0
+        for position, piece in enumerate(self.square_index):
+            if piece is not None:
+                key ^= PIECE_KEYS[piece.value][position]
+        if not self.white_turn:
+            key ^= SIDE_KEY
+        key ^= castling_hash(self.rules.castling_rights)
+        key ^= en_passant_hash(self.board, self.rules.en_passant_target, self.white_turn)
+        return key
+
+    def _relocate_piece(self, piece: Piece, to_pos: int):
+        """Versetzt eine Figur und hält Board und Feld-Index konsistent."""
+        from_pos = piece.position
+        bitboards = self.bitboards
+        if self.square_index[from_pos] is piece:
+            self.square_index[from_pos] = None
+            self.board[from_pos] = EMPTY
+            if bitboards is not None:
+                bitboards.remove(piece.value, from_pos)
+        piece.position = to_pos
+        self.square_index[to_pos] = piece
+        self.board[to_pos] = piece.value
+        if bitboards is not None:
+            bitboards.add(piece.value, to_pos)
+
+    def _take_off_board(self, piece: Piece):
+        """Nimmt eine geschlagene Figur vom Brett (Board, Indizes, Bitboards)."""
+        position = piece.position
+        piece.captured = True
+        self.square_index[position] = None
+        self.board[position] = EMPTY
+        if self.bitboards is not None:
+            self.bitboards.remove(piece.value, position)
+        self.piece_lists[piece.color][piece.type].remove(piece)
+        if piece.type == KING:
+            self.king_index[piece.color] = None
+
+    def _put_on_board(self, piece: Piece):
+        """Stellt eine geschlagene Figur auf ihr Feld zurück."""
+        position = piece.position
+        piece.captured = False
+        self.square_index[position] = piece
+        self.board[position] = piece.value
+        if self.bitboards is not None:
+            self.bitboards.add(piece.value, position)
+        self.piece_lists[piece.color][piece.type].append(piece)
+        if piece.type == KING:
+            self.king_index[piece.color] = piece
+        
+    def _promote_piece(self, piece: Piece, piece_type: int):
+        """Wandelt eine Figur in den angegebenen Figurentyp um."""
+        if self.square_index[piece.position] is piece:
+            self.board[piece.position] = piece_type * piece.color
+            lists = self.piece_lists[piece.color]
+            lists[piece.type].remove(piece)
+            lists[piece_type].append(piece)
+            if self.bitboards is not None:
+                self.bitboards.remove(piece.value, piece.position)
+                self.bitboards.add(piece_type * piece.color, piece.position)
+        piece.type = piece_type
+        piece.value = piece_type * piece.color
+        piece.symbol = PIECE_SYMBOLS.get(piece.value, '?')
         
-    def get_piece_at(self, position: int) -> Optional[Dict[str, Any]]:
+    def get_piece_at(self, position: int) -> Optional[Piece]:
         """Gibt das Figuren-Objekt an einer 10x10 Position zurück."""
-        for piece in self.pieces:
-            if not piece['captured'] and piece['position'] == position:
-                return piece
+        if 0 <= position < 120:
+            return self.square_index[position]
         return None
 
-    def get_piece_by_id(self, piece_id: int) -> Optional[Dict[str, Any]]:
+    def get_piece_by_id(self, piece_id: int) -> Optional[Piece]:
         """Gibt das Figuren-Objekt anhand der ID zurück."""
-        for piece in self.pieces:
-            if piece['id'] == piece_id:
-                return piece
-        return None
+        return self.piece_index.get(piece_id)
 
-    def get_king(self, color: int) -> Optional[Dict[str, Any]]:
+    def get_king(self, color: int) -> Optional[Piece]:
         """Gibt das König-Objekt der angegebenen Farbe zurück."""
-        for piece in self.pieces:
-            if piece['type'] == KING and piece['color'] == color and not piece['captured']:
-                return piece
-        return None
+        return self.king_index.get(color)
+
+    def get_pieces(self, color: int, piece_type: int) -> List[Piece]:
+        """Figuren einer Farbe und eines Typs auf dem Brett (Liste nicht verändern)."""
+        return self.piece_lists[color][piece_type]
+
+    def active_pieces(self, color: Optional[int] = None):
+        """Liefert alle Figuren auf dem Brett, optional nur einer Farbe."""
+        for side in ((WHITE, BLACK) if color is None else (color,)):
+            for pieces in self.piece_lists[side].values():
+                yield from pieces
         
+    def has_non_pawn_material(self, color: int) -> bool:
+        """Besitzt die Farbe außer König und Bauern noch Figuren?"""
+        lists = self.piece_lists[color]
+        return bool(lists[KNIGHT] or lists[BISHOP] or lists[ROOK] or lists[QUEEN])
+
     def is_valid_position(self, position: int) -> bool:
         """Prüft, ob eine Position innerhalb des 8x8 Spielfeldes liegt (21-98)."""
         if 20 < position < 100:
@@ -218,165 +496,115 @@ class ChesstegEngine:
     # ZUG-AUSFÜHRUNG
     # =========================================================================
 
-    def make_move(self, move: Dict[str, Any]) -> bool:
-        """Führt einen Zug aus und aktualisiert den Spielzustand - KORRIGIERTE VERSION"""
+    def make_move(self, move) -> bool:
+        """
+        Führt einen Zug aus und aktualisiert den Spielzustand - KORRIGIERTE VERSION
+        Akzeptiert das Zug-Diktionär (GUI) oder einen gepackten Integer-Zug.
+        """
         
-        # 1. Speichere den aktuellen Zustand vor der Ausführung
-        self._save_state()
-
-        # 2. Führe den Zug durch (Figuren-Update)
-        piece = self.get_piece_at(move['from_pos'])
-        if not piece:
-            print(f"❌ Keine Figur auf Startposition {self._position_to_notation(move['from_pos'])}")
-            self._restore_state() 
+        # 1. Zug inkrementell ausführen (liefert den Undo-Eintrag)
+        record = self._apply_move_internal(move)
+        if record is None:
+            from_pos = move_from(move) if isinstance(move, int) else move['from_pos']
+            print(f"❌ Keine Figur auf Startposition {self._position_to_notation(from_pos)}")
             return False
 
-        # 🚨 NEU: Spezielle Zug-Behandlung VOR der normalen Ausführung
-        # Rochade
-        if move.get('special_type') == 'castling':
-            return self._execute_castling_move(move, piece)
-        
-        # En Passant
-        if move.get('special_type') == 'en_passant':
-            return self._execute_en_passant_move(move, piece)
-        
-        # Bauernumwandlung
-        if move.get('promotion_piece'):
-            return self._execute_promotion_move(move, piece)
-
-        # Normale Zugausführung
-        captured_piece = self.get_piece_at(move['to_pos'])
-        if captured_piece:
-            captured_piece['captured'] = True
-            move['captured_piece_id'] = captured_piece['id']
-        else:
-            move['captured_piece_id'] = None
-            
-        # Figur an Zielposition bewegen
-        piece['position'] = move['to_pos']
-        piece['has_moved'] = True 
+        if not isinstance(move, int):
+            captured_piece = record.captured
+            move['captured_piece_id'] = captured_piece.id if captured_piece else None
 
-        # 3. Spezielle Regeln ausführen
-        if hasattr(self.rules, 'process_move'):
-            self.rules.process_move(move, piece, captured_piece)
+        # 2. Nur die Änderungen in der Historie speichern
+        self.move_history.append(record)
+        self.invalidate_move_cache()
 
-        # 4. Board und Zustand synchronisieren
-        self.synchronize_board_state()
-        self.white_turn = not self.white_turn
+        # 3. Optional: inkrementelle Strukturen gegen Neuaufbau prüfen
+        if self.debug_consistency:
+            self._report_inconsistencies('make_move')
         
-        # 5. Prüfe auf Schachmatt/Patt
+        # 4. Prüfe auf Schachmatt/Patt
         self._check_game_end()
 
         return True
 
-    def _execute_castling_move(self, move: Dict[str, Any], king: Dict[str, Any]) -> bool:
-        """Führt Rochade aus"""
-        rook = self.get_piece_by_id(move['rook_id'])
-        if not rook:
+    def undo_move(self) -> bool:
+        """Macht den letzten Zug rückgängig."""
+        if not self.move_history:
             return False
-            
-        # Bewege König
-        king['position'] = move['to_pos']
-        king['has_moved'] = True
-        
-        # Bewege Turm  
-        rook['position'] = move['rook_to']
-        rook['has_moved'] = True
-        
-        # Rochaderechte aktualisieren
-        self.rules._revoke_castling_rights(king['color'])
-        
-        self.synchronize_board_state()
-        self.white_turn = not self.white_turn
-        self._check_game_end()
-        return True
 
-    def _execute_en_passant_move(self, move: Dict[str, Any], pawn: Dict[str, Any]) -> bool:
-        """Führt en Passant aus"""
-        # Bewege Bauer
-        pawn['position'] = move['to_pos']
+        # Letzten Undo-Eintrag exakt zurückspielen
+        record = self.move_history.pop()
+        self._undo_move_internal(record)
+        self.invalidate_move_cache()
         
-        # Schlage gegnerischen Bauer
-        captured_pawn_pos = move['capture_pos']
-        captured_pawn = self.get_piece_at(captured_pawn_pos)
-        if captured_pawn:
-            captured_pawn['captured'] = True
-            move['captured_piece_id'] = captured_pawn['id']
-        
-        self.synchronize_board_state()
-        self.white_turn = not self.white_turn
-        self._check_game_end()
+        if self.debug_consistency:
+            self._report_inconsistencies('undo_move')
         return True
 
-    def _execute_promotion_move(self, move: Dict[str, Any], pawn: Dict[str, Any]) -> bool:
-        """Führt Bauernumwandlung aus"""
-        # Normale Bewegung
-        captured_piece = self.get_piece_at(move['to_pos'])
-        if captured_piece:
-            captured_piece['captured'] = True
-            move['captured_piece_id'] = captured_piece['id']
-        
-        # Bewege Bauer zur Umwandlungsposition
-        pawn['position'] = move['to_pos']
-        
-        # Umwandlung durchführen
-        promotion_piece_type = move['promotion_piece']
-        pawn['type'] = promotion_piece_type
-        pawn['value'] = promotion_piece_type * pawn['color']
-        pawn['symbol'] = PIECE_SYMBOLS.get(pawn['value'], '?')
-        
-        self.synchronize_board_state()
-        self.white_turn = not self.white_turn
-        self._check_game_end()
+    def make_search_move(self, move) -> bool:
+        """
+        Leichtgewichtige Zugausführung für die Suche: nur inkrementelles
+        Ausführen und Undo-Eintrag, ohne Board-Synchronisation, ohne
+        Spielende-Prüfung und ohne Ausgaben. Matt/Patt erkennt die Suche
+        selbst an einer leeren Zugliste.
+        """
+        self._enter_search_ply()
+        record = self._apply_move_internal(move)
+        if record is None:
+            self._search_ply -= 1
+            return False
+        self.move_history.append(record)
         return True
 
-    def undo_move(self) -> bool:
-        """Macht den letzten Zug rückgängig."""
+    def undo_search_move(self) -> bool:
+        """Gegenstück zu `make_search_move`."""
         if not self.move_history:
             return False
+        self._undo_move_internal(self.move_history.pop())
+        if self._search_ply:
+            self._search_ply -= 1
+        return True
 
-        # Lade den vorherigen Zustand
-        previous_state = self.move_history.pop()
-        
-        self.pieces = previous_state['pieces']
-        self.white_turn = previous_state['white_turn']
-        self.checkmate = previous_state['checkmate']
-        self.stalemate = previous_state['stalemate']
-        self.next_piece_id = previous_state['next_piece_id']
-        
-        # Lade den Zustand der Regeln
-        self.rules.en_passant_target = previous_state['rules']['en_passant_target']
-        self.rules.castling_rights = previous_state['rules']['castling_rights']
-        
-        self.synchronize_board_state()
+    def _enter_search_ply(self):
+        """
+        Vor jedem Such- oder Nullzug: beim Verlassen der Spielstellung den
+        Zug-Cache beider Farben füllen, solange das Brett noch die Spielstellung
+        zeigt. Während der Suche beantwortet legal_moves_by_square Abfragen
+        (GUI-Klicks, Status) dann nur noch aus diesem Cache.
+        """
+        if not self._search_ply:
+            self.legal_moves_by_square(WHITE)
+            self.legal_moves_by_square(BLACK)
+        self._search_ply += 1
+
+    def make_null_move(self):
+        """
+        Nullzug für die Suche: die Seite am Zug passt. Nur Zugrecht, en Passant
+        Ziel und Hash-Schlüssel ändern sich; `undo_null_move` stellt sie wieder
+        her. Die Zugzähler bleiben unverändert.
+        """
+        self._enter_search_ply()
+        rules = self.rules
+        self.null_move_history.append((rules.en_passant_target, self.hash_key))
+        key = self.hash_key ^ en_passant_hash(self.board, rules.en_passant_target, self.white_turn)
+        rules.en_passant_target = None
+        self.white_turn = not self.white_turn
+        self.hash_key = key ^ SIDE_KEY
+
+    def undo_null_move(self) -> bool:
+        """Gegenstück zu `make_null_move`."""
+        if not self.null_move_history:
+            return False
+        self.rules.en_passant_target, self.hash_key = self.null_move_history.pop()
+        self.white_turn = not self.white_turn
+        self._search_ply -= 1
         return True
 
-    def _save_state(self):
-        """Speichert den aktuellen Spielzustand in der Historie."""
-        current_state = {
-            'pieces': copy.deepcopy(self.pieces),
-            'white_turn': self.white_turn,
-            'checkmate': self.checkmate,
-            'stalemate': self.stalemate,
-            'next_piece_id': self.next_piece_id,
-            'rules': {
-                'en_passant_target': self.rules.en_passant_target,
-                'castling_rights': copy.deepcopy(self.rules.castling_rights)
-            }
-        }
-        self.move_history.append(current_state)
-
-    def _restore_state(self):
-        """Stellt den Zustand aus dem letzten Eintrag in der Historie wieder her."""
-        if self.move_history:
-            self.pieces = self.move_history[-1]['pieces']
-            self.white_turn = self.move_history[-1]['white_turn']
-            self.checkmate = self.move_history[-1]['checkmate']
-            self.stalemate = self.move_history[-1]['stalemate']
-            self.next_piece_id = self.move_history[-1]['next_piece_id']
-            self.rules.en_passant_target = self.move_history[-1]['rules']['en_passant_target']
-            self.rules.castling_rights = self.move_history[-1]['rules']['castling_rights']
-            self.synchronize_board_state()
+    def perft(self, depth: int, use_hash: bool = False, processes: int = 1) -> int:
+        """
+        Anzahl der Blattknoten des legalen Zugbaums bis `depth` (siehe perft.py,
+        dort auch Divide-Ausgabe und Knoten/s).
+        """
+        return run_perft(self, depth, use_hash, processes)['nodes']
 
     # =========================================================================
     # SCHACH/MATT/PATT-PRÜFUNG
@@ -384,8 +612,51 @@ class ChesstegEngine:
     
     def generate_all_moves(self, color: int) -> List[Dict[str, Any]]:
         """Generiert alle legalen Züge für die angegebene Farbe."""
-        # Aufruf der korrigierten Methode im MoveGenerator
-        return self.move_generator.generate_moves(color)
+        # Aus dem Zug-Cache der Stellung (neu generiert nur nach Änderungen)
+        return [move for moves in self.legal_moves_by_square(color).values() for move in moves]
+
+    def legal_moves_by_square(self, color: int) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Legale Züge der Farbe gruppiert nach Startfeld. Pro Stellung und Farbe
+        wird nur einmal generiert; make_move, undo_move, neue Stellungen und
+        Editor-Änderungen verwerfen den Cache.
+
+        Solange Such- oder Perft-Züge ausgeführt sind, gelten die Züge der
+        Spielstellung, aus der die Suche gestartet ist: sie kommen nur aus dem
+        Cache, das Brett der laufenden Suche wird nicht gelesen. Züge des
+        aktuellen Suchknotens liefert generate_moves_by_square.
+        """
+        if self._search_ply:
+            return self._legal_move_cache.get(color, {})
+        if self._legal_move_cache_key != self.hash_key:
+            self._legal_move_cache.clear()
+            self._legal_move_cache_key = self.hash_key
+        by_square = self._legal_move_cache.get(color)
+        if by_square is None:
+            by_square = self.generate_moves_by_square(color)
+            self._legal_move_cache[color] = by_square
+        return by_square
+
+    def generate_moves_by_square(self, color: int) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Generiert die legalen Züge der Farbe in der Stellung auf dem Brett,
+        gruppiert nach Startfeld (ohne Cache, auch mitten in der Suche).
+        """
+        by_square = {}
+        for move in self.move_generator.generate_moves(color):
+            by_square.setdefault(move['from_pos'], []).append(move)
+        return by_square
+
+    def legal_moves_from(self, position: int, color: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Legale Züge von einem Startfeld (Standard: Seite am Zug)."""
+        if color is None:
+            color = WHITE if self.white_turn else BLACK
+        return self.legal_moves_by_square(color).get(position, [])
+
+    def invalidate_move_cache(self):
+        """Verwirft die zwischengespeicherten legalen Züge."""
+        self._legal_move_cache.clear()
+        self._legal_move_cache_key = None
 
     def is_king_in_check(self, color: int) -> bool:
         """Prüft, ob der König der gegebenen Farbe im Schach steht."""
@@ -395,7 +666,7 @@ class ChesstegEngine:
             
         opponent_color = BLACK if color == WHITE else WHITE
         
-        return self.move_generator.is_square_attacked(king['position'], opponent_color)
+        return self.move_generator.is_square_attacked(king.position, opponent_color)
         
     def _check_game_end(self):
         """Prüft, ob die aktuelle Stellung Schachmatt oder Patt ist."""
@@ -425,7 +696,11 @@ class ChesstegEngine:
             'white_turn': self.white_turn,
             'checkmate': self.checkmate,
             'stalemate': self.stalemate,
-            'board': self.board.copy()
+            'board': self.board.copy(),
+            'en_passant_target': self.rules.en_passant_target,
+            'castling_rights': dict(self.rules.castling_rights),
+            'halfmove_clock': self.halfmove_clock,
+            'fullmove_number': self.fullmove_number
         }
 
     def restore_snapshot(self, snapshot):
@@ -435,32 +710,311 @@ class ChesstegEngine:
         self.checkmate = snapshot['checkmate']
         self.stalemate = snapshot['stalemate']
         self.board = snapshot['board']
+        self.rules.en_passant_target = snapshot['en_passant_target']
+        self.rules.castling_rights = dict(snapshot['castling_rights'])
+        self.halfmove_clock = snapshot['halfmove_clock']
+        self.fullmove_number = snapshot['fullmove_number']
+        self._rebuild_piece_index()
+        self.hash_key = self.compute_hash_key()
+        self.invalidate_move_cache()
+        # Die Undo-Einträge verweisen auf die ersetzten Figuren-Objekte
+        self.move_history.clear()
+        self.null_move_history.clear()
+        self._search_ply = 0
+
+    def _apply_move_internal(self, move) -> Optional[UndoRecord]:
+        """
+        Führt einen Zug inkrementell aus und gibt einen kompakten Undo-Eintrag
+        zurück, mit dem `_undo_move_internal` den Zug exakt zurücknimmt.
+        Board, Figuren-Index, Rochaderechte, en Passant und Zugrecht werden
+        aktualisiert; es findet keine Spielende-Prüfung statt.
+        Der Zug ist ein gepackter Integer (move_encoding) oder ein Zug-Diktionär.
+        """
+        if not isinstance(move, int):
+            move = move_from_dict(move)
+        from_pos = move & SQUARE_MASK
+        to_pos = (move >> TO_SHIFT) & SQUARE_MASK
+        piece = self.square_index[from_pos]
+        if piece is None:
+            return None
+
+        rules = self.rules
+        color = piece.color
+        promotion_piece = PROMOTION_TYPES[(move >> PROMOTION_SHIFT) & PROMOTION_MASK]
+        castling_rights = rules.castling_rights
+        previous_castling = None
+        previous_hash = self.hash_key
+        key = previous_hash ^ en_passant_hash(self.board, rules.en_passant_target, self.white_turn)
+
+        rook = None
+        rook_from = rook_to = None
+        rook_has_moved = False
+        if move & FLAG_CASTLING:
+            rook_from, rook_to = CASTLING_ROOK_SQUARES[to_pos]
+            rook = self.square_index[rook_from]
+            if rook is None:
+                return None
+            rook_has_moved = rook.has_moved
+
+        # Geschlagene Figur entfernen (bei en Passant nicht auf dem Zielfeld)
+        capture_pos = to_pos - 10 * color if move & FLAG_EN_PASSANT else to_pos
+        captured = self.square_index[capture_pos]
+        if captured is not None:
+            self._take_off_board(captured)
+            key ^= PIECE_KEYS[captured.value][capture_pos]
+            if captured.type == ROOK:
+                # Geschlagener Turm auf seinem Ausgangsfeld: Rochaderecht erlischt
+                previous_castling = dict(castling_rights)
+                rules._revoke_rook_castling_rights(captured.color, capture_pos)
+        else:
+            capture_pos = None
 
-    def _apply_move_internal(self, move):
-        """Wendet einen Zug an, ohne den Spielzustand vollständig zu ändern (für Suchalgorithmus)."""
-        piece = self.get_piece_by_id(move['piece_id'])
-        if not piece:
-            return
-            
-        # Alte Position leeren
-        self.board[piece['position']] = EMPTY
-        
-        # Geschlagene Figur entfernen
-        if move.get('capture_pos'):
-            captured_piece = self.get_piece_at(move['capture_pos'])
-            if captured_piece:
-                captured_piece['captured'] = True
-                self.board[move['capture_pos']] = EMPTY
-        
         # Figur bewegen
-        piece['position'] = move['to_pos']
-        self.board[move['to_pos']] = piece['value']
-        
-        # Promotion behandeln
-        if move.get('promotion_piece'):
-            piece['type'] = move['promotion_piece']
-            piece['value'] = move['promotion_piece'] * piece['color']
-            piece['symbol'] = PIECE_SYMBOLS.get(piece['value'], '?')
+        has_moved = piece.has_moved
+        key ^= PIECE_KEYS[piece.value][from_pos]
+        self._relocate_piece(piece, to_pos)
+        piece.has_moved = True
+
+        promoted = False
+        if promotion_piece:
+            self._promote_piece(piece, promotion_piece)
+            promoted = True
+        key ^= PIECE_KEYS[piece.value][to_pos]
+
+        if rook is not None:
+            self._relocate_piece(rook, rook_to)
+            rook.has_moved = True
+            rook_keys = PIECE_KEYS[rook.value]
+            key ^= rook_keys[rook_from] ^ rook_keys[rook_to]
+
+        # Rochaderechte nach Königs- oder Turmzug
+        piece_type = PAWN if promoted else piece.type
+        if piece_type == KING or piece_type == ROOK:
+            if previous_castling is None:
+                previous_castling = dict(castling_rights)
+            if piece_type == KING:
+                rules._revoke_castling_rights(color)
+            else:
+                rules._revoke_rook_castling_rights(color, from_pos)
+        if previous_castling is not None:
+            if previous_castling == castling_rights:
+                previous_castling = None
+            else:
+                for name, allowed in previous_castling.items():
+                    if allowed != castling_rights[name]:
+                        key ^= CASTLING_KEYS[name]
+
+        # En Passant Ziel gilt immer nur für genau einen Halbzug
+        previous_en_passant = rules.en_passant_target
+        if piece_type == PAWN and abs(to_pos - from_pos) == 20:
+            rules.en_passant_target = (from_pos + to_pos) // 2
+        else:
+            rules.en_passant_target = None
+
+        record = UndoRecord(piece, from_pos, to_pos, captured, capture_pos, promoted,
+                            has_moved, rook, rook_from, rook_to, rook_has_moved,
+                            previous_en_passant, previous_castling,
+                            self.checkmate, self.stalemate, previous_hash,
+                            self.halfmove_clock)
+
+        # Zugzähler (FEN)
+        if piece_type == PAWN or captured is not None:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if not self.white_turn:
+            self.fullmove_number += 1
+
+        self.white_turn = not self.white_turn
+        self.hash_key = key ^ SIDE_KEY ^ en_passant_hash(self.board, rules.en_passant_target,
+                                                         self.white_turn)
+        return record
+
+    def _undo_move_internal(self, record: UndoRecord):
+        """Nimmt einen mit `_apply_move_internal` ausgeführten Zug exakt zurück."""
+        piece = record.piece
+
+        self.white_turn = not self.white_turn
+        self.hash_key = record.hash_key
+        self.halfmove_clock = record.halfmove_clock
+        if not self.white_turn:
+            self.fullmove_number -= 1
+        self.checkmate = record.checkmate
+        self.stalemate = record.stalemate
+        self.rules.en_passant_target = record.en_passant_target
+        if record.castling_rights is not None:
+            self.rules.castling_rights = record.castling_rights
+
+        if record.rook is not None:
+            self._relocate_piece(record.rook, record.rook_from)
+            record.rook.has_moved = record.rook_has_moved
+
+        if record.promoted:
+            self._promote_piece(piece, PAWN)
+
+        self._relocate_piece(piece, record.from_pos)
+        piece.has_moved = record.has_moved
+
+        if record.captured is not None:
+            self._put_on_board(record.captured)
+
+    # =========================================================================
+    # FEN IMPORT/EXPORT
+    # =========================================================================
+
+    def load_fen(self, fen: str, detect_game_end: bool = True):
+        """
+        Stellt die Stellung aus einer FEN-Zeichenkette her (Figuren, Zugrecht,
+        Rochaderechte, en Passant Ziel, Halbzug- und Zugzähler).
+        Die Zugzähler dürfen fehlen (Vorgabe "0 1").
+
+        Args:
+            fen: Stellung in Forsyth-Edwards-Notation
+            detect_game_end: Matt/Patt der geladenen Stellung bestimmen
+                             (kann bei Massenverarbeitung abgeschaltet werden)
+
+        Raises:
+            ValueError: bei fehlerhafter FEN
+        """
+        fields = fen.split()
+        if len(fields) == 4:
+            fields += ['0', '1']
+        if len(fields) != 6:
+            raise ValueError(f"FEN benötigt 4 oder 6 Felder: {fen!r}")
+        placement, side, castling, en_passant, halfmove, fullmove = fields
+
+        ranks = placement.split('/')
+        if len(ranks) != 8:
+            raise ValueError(f"FEN benötigt 8 Reihen: {placement!r}")
+        if side not in ('w', 'b'):
+            raise ValueError(f"Ungültiges Zugrecht in FEN: {side!r}")
+
+        # Figuren aufstellen (erste Reihe der FEN ist die 8. Reihe)
+        placed = []
+        for rank_index, rank in enumerate(ranks):
+            row = 9 - rank_index
+            file = 1
+            for char in rank:
+                if char.isdigit():
+                    file += int(char)
+                    continue
+                piece_type = FEN_PIECE_TYPES.get(char.lower())
+                if piece_type is None or file > 8:
+                    raise ValueError(f"Ungültige Reihe in FEN: {rank!r}")
+                placed.append((piece_type, WHITE if char.isupper() else BLACK, row * 10 + file))
+                file += 1
+            if file != 9:
+                raise ValueError(f"Reihe hat nicht 8 Felder: {rank!r}")
+
+        castling_rights = {name: False for _, name in FEN_CASTLING}
+        if castling != '-':
+            letters = dict(FEN_CASTLING)
+            for char in castling:
+                if char not in letters:
+                    raise ValueError(f"Ungültige Rochaderechte in FEN: {castling!r}")
+                castling_rights[letters[char]] = True
+
+        en_passant_target = None
+        if en_passant != '-':
+            en_passant_target = self._notation_to_position(en_passant)
+            if en_passant_target is None or en_passant_target // 10 not in (4, 7):
+                raise ValueError(f"Ungültiges en Passant Feld in FEN: {en_passant!r}")
+
+        try:
+            halfmove_clock = int(halfmove)
+            fullmove_number = int(fullmove)
+        except ValueError:
+            raise ValueError(f"Ungültige Zugzähler in FEN: {halfmove!r} {fullmove!r}") from None
+
+        # Zustand erst nach erfolgreichem Parsen ersetzen
+        self._setup_position(placed, side == 'w', castling_rights, en_passant_target,
+                             halfmove_clock, fullmove_number, detect_game_end)
+
+    def _setup_position(self, placed, white_turn: bool, castling_rights: Dict[str, bool],
+                        en_passant_target: Optional[int], halfmove_clock: int,
+                        fullmove_number: int, detect_game_end: bool):
+        """Ersetzt die Stellung durch die angegebenen Figuren (Typ, Farbe, Position)."""
+        self.pieces.clear()
+        self.piece_index.clear()
+        self.next_piece_id = 1
+        self.rules.__init__(self)
+        for piece_type, color, position in placed:
+            self._add_piece(piece_type, color, position)
+            if piece_type == PAWN:
+                start_row = 3 if color == WHITE else 8
+                self.pieces[-1].has_moved = position // 10 != start_row
+
+        self.rules.castling_rights = castling_rights
+        self.rules.en_passant_target = en_passant_target
+        self.white_turn = white_turn
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = max(1, fullmove_number)
+        self.checkmate = False
+        self.stalemate = False
+        self.move_history.clear()
+        self.null_move_history.clear()
+        self._search_ply = 0
+
+        self.synchronize_board_state(silent=True)
+        if detect_game_end:
+            self._check_game_end()
+
+    def get_fen(self) -> str:
+        """Gibt die aktuelle Stellung als FEN-Zeichenkette zurück."""
+        square_index = self.square_index
+        ranks = []
+        for row in range(9, 1, -1):
+            rank = ''
+            empty = 0
+            for position in range(row * 10 + 1, row * 10 + 9):
+                piece = square_index[position]
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                letter = FEN_PIECE_LETTERS[piece.type]
+                rank += letter.upper() if piece.color == WHITE else letter
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+
+        rights = self.rules.castling_rights
+        castling = ''.join(char for char, name in FEN_CASTLING if rights.get(name)) or '-'
+        en_passant_target = self.rules.en_passant_target
+        en_passant = '-' if en_passant_target is None else self._position_to_notation(en_passant_target)
+
+        return (f"{'/'.join(ranks)} {'w' if self.white_turn else 'b'} {castling} "
+                f"{en_passant} {self.halfmove_clock} {self.fullmove_number}")
+
+    # =========================================================================
+    # BINÄRE STELLUNGSKODIERUNG (position_codec)
+    # =========================================================================
+
+    def encode_position(self) -> bytes:
+        """
+        Kodiert die aktuelle Stellung in POSITION_SIZE (38) Bytes - für die
+        Übergabe an Worker-Prozesse statt eines gepickelten Engine-Objekts.
+        Die Zughistorie wird nicht übertragen.
+        """
+        return pack_position(self.square_index, self.white_turn, self.rules.castling_rights,
+                             self.rules.en_passant_target, self.halfmove_clock,
+                             self.fullmove_number)
+
+    def decode_position(self, data: bytes, detect_game_end: bool = False):
+        """
+        Stellt eine mit `encode_position` kodierte Stellung her.
+
+        Raises:
+            ValueError: bei ungültigen Daten
+        """
+        self._setup_position(*unpack_position(data), detect_game_end)
+
+    @classmethod
+    def from_position(cls, data: bytes, use_bitboards: bool = False) -> 'ChesstegEngine':
+        """Erzeugt eine Engine direkt aus einer kodierten Stellung."""
+        return cls(use_bitboards=use_bitboards, position=data)
 
     # =========================================================================
     # HILFSFUNKTIONEN (NOTATION)
@@ -475,6 +1029,15 @@ class ChesstegEngine:
             return f"{files[file]}{row - 1}"
         return "??"
 
+    def _notation_to_position(self, notation: str) -> Optional[int]:
+        """Konvertiert algebraische Notation (z.B. 'e4') zu interner Position"""
+        if len(notation) != 2:
+            return None
+        file = 'abcdefgh'.find(notation[0].lower()) + 1
+        if file == 0 or notation[1] not in '12345678':
+            return None
+        return (int(notation[1]) + 1) * 10 + file
+
     # =========================================================================
     # EDITOR-FUNKTIONEN
     # =========================================================================
@@ -487,31 +1050,41 @@ class ChesstegEngine:
         # Entferne existierende Figur
         existing_piece = self.get_piece_at(position)
         if existing_piece:
-            existing_piece['captured'] = True
+            self._take_off_board(existing_piece)
         
         # Füge neue Figur hinzu (verwendet _add_piece mit neuer ID)
         self._add_piece(piece_type, color, position)
+        self._put_on_board(self.pieces[-1])
         
-        # Synchronisiere das Board, um die neue Figur anzuzeigen
-        self.synchronize_board_state(silent=True)
+        self._editor_position_changed()
         return True
     
     def editor_remove_piece(self, position):
         """Entfernt eine Figur vom Brett (Editor-Funktion)"""
         piece = self.get_piece_at(position)
         if piece:
-            piece['captured'] = True
-            self.synchronize_board_state(silent=True)
+            self._take_off_board(piece)
+            self._editor_position_changed()
             return True
         
         return False
     
     def editor_clear_board(self):
         """Entfernt alle Figuren vom Brett"""
-        for piece in self.pieces:
-            piece['captured'] = True
-        self.synchronize_board_state(silent=True)
+        for piece in list(self.active_pieces()):
+            self._take_off_board(piece)
+        self._editor_position_changed()
     
     def editor_standard_position(self):
         """Setzt die Standard-Anfangsstellung"""
-        self.initialize_pieces()
\ No newline at end of file
+        self.initialize_pieces()
+
+    def _editor_position_changed(self):
+        """Gemeinsamer Abschluss der Editor-Funktionen."""
+        # Der en Passant Anteil hängt von den Nachbarfeldern ab -> Schlüssel neu berechnen
+        self.hash_key = self.compute_hash_key()
+        self.invalidate_move_cache()
+        # Die Undo-Einträge beziehen sich auf die alte Stellung
+        self.move_history.clear()
+        self.null_move_history.clear()
+        self._search_ply = 0
\ No newline at end of file
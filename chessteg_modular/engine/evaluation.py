@@ -6,6 +6,9 @@ Vollständige Bewertungsfunktion für Schachstellungen
 import math
 from typing import Dict, Any, List
 
+from bitboard import SQ64, SQ120, FILE_MASKS, popcount, iter_bits
+from tables import KNIGHT_TARGETS, SLIDER_RAYS, PAWN_SHIELD
+
 
 class PositionEvaluator:
     """
@@ -145,13 +148,18 @@ class PositionEvaluator:
         """
         material = 0
         
-        for piece in self.engine.pieces:
-            if piece['captured']:
-                continue
-            
-            piece_value = self.evaluation_table['material'].get(piece['type'], 0)
+        bitboards = self.engine.bitboards
+        if bitboards is not None:
+            # Bitboard-Pfad: Figuren per Populationszählung
+            for piece_type, piece_value in self.evaluation_table['material'].items():
+                material += piece_value * (popcount(bitboards.pieces[piece_type]) -
+                                           popcount(bitboards.pieces[-piece_type]))
+            return material
+        
+        for piece in self.engine.active_pieces():
+            piece_value = self.evaluation_table['material'].get(piece.type, 0)
             
-            if piece['color'] == 1:  # WHITE
+            if piece.color == 1:  # WHITE
                 material += piece_value
             else:  # BLACK
                 material -= piece_value
@@ -164,15 +172,12 @@ class PositionEvaluator:
         """
         position_score = 0
         
-        for piece in self.engine.pieces:
-            if piece['captured']:
-                continue
-            
-            board_row, board_col = self._position_to_coordinates(piece['position'])
+        for piece in self.engine.active_pieces():
+            board_row, board_col = self._position_to_coordinates(piece.position)
             
             # Für weiße Figuren: Tabelle von unten nach oben
             # Für schwarze Figuren: Tabelle spiegeln
-            if piece['color'] == 1:  # WHITE
+            if piece.color == 1:  # WHITE
                 row = board_row - 2  # 0-7 von weißer Seite
             else:  # BLACK
                 row = 7 - (board_row - 2)  # 0-7 von schwarzer Seite
@@ -184,9 +189,9 @@ class PositionEvaluator:
             col = max(0, min(7, col))
             
             # Positionswert aus Tabelle holen
-            pos_value = self.evaluation_table['position'][piece['type']][row][col]
+            pos_value = self.evaluation_table['position'][piece.type][row][col]
             
-            if piece['color'] == 1:
+            if piece.color == 1:
                 position_score += pos_value
             else:
                 position_score -= pos_value
@@ -199,8 +204,17 @@ class PositionEvaluator:
         """
         attack_score = 0
         
-        for piece in self.engine.pieces:
-            if piece['captured']:
+        bitboards = self.engine.bitboards
+        board = self.engine.board
+        material_values = self.evaluation_table['material']
+        
+        for piece in self.engine.active_pieces():
+            if bitboards is not None:
+                # Bitboard-Pfad: nur angegriffene gegnerische Figuren durchlaufen
+                attacks = bitboards.attacks_from(piece.value, SQ64[piece.position])
+                for sq in iter_bits(attacks & bitboards.occupied[-piece.color]):
+                    attack_bonus = material_values[abs(board[SQ120[sq]])] * 0.1
+                    attack_score += attack_bonus * piece.color
                 continue
             
             # Angriffene Felder dieser Figur
@@ -208,12 +222,12 @@ class PositionEvaluator:
             
             for square in attacked_squares:
                 target_piece = self._get_piece_at(square)
-                if target_piece and target_piece['color'] != piece['color']:
+                if target_piece and target_piece.color != piece.color:
                     # Bonus für Angriff auf gegnerische Figur
-                    target_value = self.evaluation_table['material'][target_piece['type']]
+                    target_value = self.evaluation_table['material'][target_piece.type]
                     attack_bonus = target_value * 0.1  # 10% des Figurenwerts
                     
-                    if piece['color'] == 1:
+                    if piece.color == 1:
                         attack_score += attack_bonus
                     else:
                         attack_score -= attack_bonus
@@ -226,18 +240,15 @@ class PositionEvaluator:
         """
         defense_score = 0
         
-        for piece in self.engine.pieces:
-            if piece['captured']:
-                continue
-            
+        for piece in self.engine.active_pieces():
             # Zähle Verteidiger dieser Figur
             defenders = self._get_defenders(piece)
-            piece_value = self.evaluation_table['material'][piece['type']]
+            piece_value = self.evaluation_table['material'][piece.type]
             
             # Bonus für verteidigte Figuren
             defense_bonus = len(defenders) * piece_value * 0.05  # 5% pro Verteidiger
             
-            if piece['color'] == 1:
+            if piece.color == 1:
                 defense_score += defense_bonus
             else:
                 defense_score -= defense_bonus
@@ -255,7 +266,7 @@ class PositionEvaluator:
             if not king:
                 continue
             
-            king_pos = king['position']
+            king_pos = king.position
             king_row, king_col = self._position_to_coordinates(king_pos)
             
             # Strafe für exponierten König in der Mitte
@@ -280,25 +291,52 @@ class PositionEvaluator:
         Bewertet Bewegungsfreiheit der Figuren
         """
         mobility_score = 0
+        bitboards = self.engine.bitboards
         
-        for piece in self.engine.pieces:
-            if piece['captured'] or piece['type'] == 99:  # König ausgeschlossen
+        for piece in self.engine.active_pieces():
+            if piece.type == 99:  # König ausgeschlossen
                 continue
             
-            # KORREKTUR: Verwende move_generator statt engine direkt
-            possible_moves = self.engine.move_generator.generate_piece_moves(piece)
-            move_count = len(possible_moves)
+            if bitboards is not None and piece.type != 1:
+                # Bitboard-Pfad: Angriffsfelder ohne eigene Figuren zählen
+                attacks = bitboards.attacks_from(piece.value, SQ64[piece.position])
+                move_count = popcount(attacks & ~bitboards.occupied[piece.color])
+            elif piece.type != 1:
+                # Vorberechnete Tabellen: Zielfelder ohne eigene Figuren zählen
+                move_count = self._count_mobility(piece)
+            else:
+                # KORREKTUR: Verwende move_generator statt engine direkt
+                possible_moves = self.engine.move_generator.generate_piece_moves_packed(piece)
+                move_count = len(possible_moves)
             
             # Mobilitätsbonus basierend auf Figurentyp
-            mobility_bonus = move_count * self._get_mobility_weight(piece['type'])
+            mobility_bonus = move_count * self._get_mobility_weight(piece.type)
             
-            if piece['color'] == 1:
+            if piece.color == 1:
                 mobility_score += mobility_bonus
             else:
                 mobility_score -= mobility_bonus
         
         return mobility_score
     
+    def _count_mobility(self, piece) -> int:
+        """Anzahl der Zielfelder eines Springers oder einer gleitenden Figur"""
+        board = self.engine.board
+        color = piece.color
+        if piece.type == 4:  # KNIGHT
+            return sum(1 for field in KNIGHT_TARGETS[piece.position] if board[field] * color <= 0)
+        
+        move_count = 0
+        for ray in SLIDER_RAYS[piece.type][piece.position]:
+            for field in ray:
+                value = board[field]
+                if value * color > 0:  # Eigene Figur blockiert
+                    break
+                move_count += 1
+                if value:  # Gegnerische Figur: Schlagzug, dann blockiert
+                    break
+        return move_count
+    
     def _evaluate_center_control(self) -> int:
         """
         Bewertet Kontrolle des Zentrums
@@ -310,8 +348,8 @@ class PositionEvaluator:
             # Figur auf Zentrumsfeld
             piece = self._get_piece_at(field)
             if piece:
-                piece_value = self.evaluation_table['material'][piece['type']] / 100
-                if piece['color'] == 1:
+                piece_value = self.evaluation_table['material'][piece.type] / 100
+                if piece.color == 1:
                     center_score += piece_value * 5
                 else:
                     center_score -= piece_value * 5
@@ -319,8 +357,8 @@ class PositionEvaluator:
             # Angriffe auf Zentrumsfelder
             attackers = self._get_attackers(field)
             for attacker in attackers:
-                attacker_value = self.evaluation_table['material'][attacker['type']] / 100
-                if attacker['color'] == 1:
+                attacker_value = self.evaluation_table['material'][attacker.type] / 100
+                if attacker.color == 1:
                     center_score += attacker_value * 2
                 else:
                     center_score -= attacker_value * 2
@@ -336,15 +374,21 @@ class PositionEvaluator:
         # Doppelbauern bestrafen
         pawns_per_file = {}
         
-        for piece in self.engine.pieces:
-            if not piece['captured'] and piece['type'] == 1:  # PAWN
-                file = piece['position'] % 10
-                key = f"{file}-{piece['color']}"
-                pawns_per_file[key] = pawns_per_file.get(key, 0) + 1
-        
-        for key, count in pawns_per_file.items():
+        bitboards = self.engine.bitboards
+        if bitboards is not None:
+            # Bitboard-Pfad: Bauern je Linie per Maske und Populationszählung
+            for color in (1, -1):
+                pawns = bitboards.pieces[color]
+                for file, file_mask in enumerate(FILE_MASKS, 1):
+                    pawns_per_file[(file, color)] = popcount(pawns & file_mask)
+        else:
+            for color in (1, -1):
+                for piece in self.engine.get_pieces(color, 1):  # PAWN
+                    key = (piece.position % 10, color)
+                    pawns_per_file[key] = pawns_per_file.get(key, 0) + 1
+        
+        for (file, color), count in pawns_per_file.items():
             if count > 1:
-                color = 1 if key.endswith("1") else -1
                 double_pawn_penalty = -20 * (count - 1)  # -20 pro zusätzlichem Bauer
                 
                 if color == 1:
@@ -366,10 +410,7 @@ class PositionEvaluator:
     
     def _get_piece_at(self, position: int) -> Any:
         """Gibt Figur an einer Position zurück"""
-        for piece in self.engine.pieces:
-            if piece['position'] == position and not piece['captured']:
-                return piece
-        return None
+        return self.engine.get_piece_at(position)
     
     def _get_attacked_squares(self, piece: Dict[str, Any]) -> List[int]:
         """Gibt alle von einer Figur angegriffenen Felder zurück"""
@@ -379,13 +420,13 @@ class PositionEvaluator:
         
         # Fallback: Einfache Implementierung
         attacked_squares = []
-        piece_type = piece['type']
+        piece_type = piece.type
         
         if piece_type == 1:  # PAWN
-            color = piece['color']
+            color = piece.color
             forward = 10 if color == 1 else -10
             for side in [forward + 1, forward - 1]:
-                field = piece['position'] + side
+                field = piece.position + side
                 if self.engine.board[field] != 100:  # Nicht DUMMY
                     attacked_squares.append(field)
         
@@ -397,46 +438,24 @@ class PositionEvaluator:
         """Findet Verteidiger einer Figur"""
         defenders = []
         
-        for potential_defender in self.engine.pieces:
-            if (potential_defender['captured'] or 
-                potential_defender['color'] != piece['color']):
-                continue
-            
+        for potential_defender in self.engine.active_pieces(piece.color):
             attacked_squares = self._get_attacked_squares(potential_defender)
-            if piece['position'] in attacked_squares:
+            if piece.position in attacked_squares:
                 defenders.append(potential_defender)
         
         return defenders
     
     def _get_king(self, color: int) -> Any:
         """Findet König einer Farbe"""
-        for piece in self.engine.pieces:
-            if (piece['type'] == 99 and 
-                piece['color'] == color and 
-                not piece['captured']):
-                return piece
-        return None
+        return self.engine.get_king(color)
     
     def _count_pawn_shield(self, king_pos: int, color: int) -> int:
         """Zählt Bauern in der Nähe des Königs"""
-        king_row, king_col = self._position_to_coordinates(king_pos)
-        pawn_count = 0
-        
-        # Prüfe Bauern vor dem König
-        for file_offset in [-1, 0, 1]:
-            check_file = king_col + file_offset
-            if 1 <= check_file <= 8:
-                if color == 1:  # Weißer König
-                    pawn_row = king_row - 1  # Reihe vor dem König
-                else:  # Schwarzer König
-                    pawn_row = king_row + 1  # Reihe vor dem König
-                
-                pawn_pos = pawn_row * 10 + check_file
-                pawn = self._get_piece_at(pawn_pos)
-                if pawn and pawn['type'] == 1 and pawn['color'] == color:
-                    pawn_count += 1
+        board = self.engine.board
         
-        return pawn_count
+        # Prüfe Bauern auf den (bis zu) drei Feldern vor dem König
+        # (Weiß zieht nach oben: die Reihe vor dem weißen König ist king_row + 1)
+        return sum(1 for field in PAWN_SHIELD[color][king_pos] if board[field] == color)
     
     def _get_mobility_weight(self, piece_type: int) -> int:
         """Gibt Mobilitätsgewicht für Figurentyp zurück"""
@@ -453,10 +472,7 @@ class PositionEvaluator:
         """Findet alle Figuren, die ein Feld angreifen"""
         attackers = []
         
-        for piece in self.engine.pieces:
-            if piece['captured']:
-                continue
-            
+        for piece in self.engine.active_pieces():
             attacked_squares = self._get_attacked_squares(piece)
             if position in attacked_squares:
                 attackers.append(piece)
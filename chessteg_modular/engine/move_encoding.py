@@ -0,0 +1,160 @@
+"""
+Chessteg Move Encoding Module
+Kompakte Zugdarstellung als Integer für den Such-Hot-Path
+
+Bit-Layout eines gepackten Zuges:
+    Bits  0- 6  Startfeld (10x12 Board, 21-98)
+    Bits  7-13  Zielfeld
+    Bits 14-16  Umwandlungsfigur (Index in PROMOTION_TYPES, 0 = keine)
+    Bits 17-20  Flags (Schlag, en Passant, Rochade, Doppelschritt)
+"""
+
+from typing import Dict, Any, Optional
+
+# Figurentypen (wie in der Core Engine)
+PAWN = 1
+KNIGHT = 4
+BISHOP = 3
+ROOK = 5
+QUEEN = 9
+KING = 99
+
+# =============================================================================
+# BIT-LAYOUT
+# =============================================================================
+SQUARE_MASK = 0x7F
+TO_SHIFT = 7
+PROMOTION_SHIFT = 14
+PROMOTION_MASK = 0x7
+
+FLAG_CAPTURE = 1 << 17
+FLAG_EN_PASSANT = 1 << 18
+FLAG_CASTLING = 1 << 19
+FLAG_DOUBLE_PUSH = 1 << 20
+
+NO_MOVE = 0
+
+# Umwandlungsfiguren: Index im Zug <-> Figurentyp
+PROMOTION_TYPES = (None, KNIGHT, BISHOP, ROOK, QUEEN)
+PROMOTION_CODES = {KNIGHT: 1, BISHOP: 2, ROOK: 3, QUEEN: 4}
+
+# Rochade: Zielfeld des Königs -> (Turm von, Turm nach)
+CASTLING_ROOK_SQUARES = {
+    27: (28, 26),  # Weiß kurz:  h1-f1
+    23: (21, 24),  # Weiß lang:  a1-d1
+    97: (98, 96),  # Schwarz kurz: h8-f8
+    93: (91, 94),  # Schwarz lang: a8-d8
+}
+
+
+# =============================================================================
+# KODIEREN / DEKODIEREN
+# =============================================================================
+
+def encode_move(from_pos: int, to_pos: int, promotion_piece: Optional[int] = None,
+                flags: int = 0) -> int:
+    """Packt einen Zug in einen Integer."""
+    move = from_pos | (to_pos << TO_SHIFT) | flags
+    if promotion_piece:
+        move |= PROMOTION_CODES[promotion_piece] << PROMOTION_SHIFT
+    return move
+
+
+def move_from(move: int) -> int:
+    """Startfeld eines gepackten Zuges."""
+    return move & SQUARE_MASK
+
+
+def move_to(move: int) -> int:
+    """Zielfeld eines gepackten Zuges."""
+    return (move >> TO_SHIFT) & SQUARE_MASK
+
+
+def move_promotion(move: int) -> Optional[int]:
+    """Umwandlungsfigur (Figurentyp) oder None."""
+    return PROMOTION_TYPES[(move >> PROMOTION_SHIFT) & PROMOTION_MASK]
+
+
+def is_capture(move: int) -> bool:
+    """True für Schlagzüge inklusive en Passant."""
+    return bool(move & (FLAG_CAPTURE | FLAG_EN_PASSANT))
+
+
+def decode_move(move: int) -> Dict[str, Any]:
+    """Zerlegt einen gepackten Zug in seine Bestandteile (ohne Figurendaten)."""
+    return {
+        'from_pos': move & SQUARE_MASK,
+        'to_pos': (move >> TO_SHIFT) & SQUARE_MASK,
+        'promotion_piece': move_promotion(move),
+        'is_capture': bool(move & FLAG_CAPTURE),
+        'en_passant': bool(move & FLAG_EN_PASSANT),
+        'castling': bool(move & FLAG_CASTLING),
+        'double_pawn_push': bool(move & FLAG_DOUBLE_PUSH),
+    }
+
+
+# =============================================================================
+# UMWANDLUNG ZUM DIKTIONÄR-FORMAT (GUI, make_move)
+# =============================================================================
+
+def move_to_dict(engine, move: int) -> Dict[str, Any]:
+    """
+    Erzeugt aus einem gepackten Zug das bisherige Zug-Diktionär.
+    Muss vor der Ausführung des Zuges aufgerufen werden (liest die Figur
+    auf dem Startfeld).
+    """
+    from_pos = move & SQUARE_MASK
+    to_pos = (move >> TO_SHIFT) & SQUARE_MASK
+    promotion_piece = move_promotion(move)
+    piece = engine.get_piece_at(from_pos)
+
+    capture_pos = None
+    special_type = None
+    if move & FLAG_EN_PASSANT:
+        special_type = 'en_passant'
+        capture_pos = to_pos - 10 * piece.color
+    elif move & FLAG_CASTLING:
+        special_type = 'castling'
+    elif move & FLAG_DOUBLE_PUSH:
+        special_type = 'double_pawn_push'
+    if move & FLAG_CAPTURE:
+        capture_pos = to_pos
+
+    move_dict = {
+        'piece_id': piece.id,
+        'piece': piece,
+        'type': piece.type,
+        'color': piece.color,
+        'from_pos': from_pos,
+        'to_pos': to_pos,
+        'capture_pos': capture_pos,
+        'promotion_piece': promotion_piece,
+        'special_type': special_type
+    }
+
+    if capture_pos is not None:
+        move_dict['is_capture'] = True
+    if promotion_piece is not None:
+        move_dict['promotion_type'] = promotion_piece
+    if special_type == 'castling':
+        rook_from, rook_to = CASTLING_ROOK_SQUARES[to_pos]
+        move_dict['rook_id'] = engine.get_piece_at(rook_from).id
+        move_dict['rook_from'] = rook_from
+        move_dict['rook_to'] = rook_to
+
+    return move_dict
+
+
+def move_from_dict(move: Dict[str, Any]) -> int:
+    """Packt ein Zug-Diktionär in die Integer-Darstellung."""
+    special_type = move.get('special_type')
+    flags = 0
+    if special_type == 'en_passant':
+        flags |= FLAG_EN_PASSANT
+    elif special_type == 'castling':
+        flags |= FLAG_CASTLING
+    elif special_type == 'double_pawn_push':
+        flags |= FLAG_DOUBLE_PUSH
+    if special_type != 'en_passant' and move.get('capture_pos') is not None:
+        flags |= FLAG_CAPTURE
+    return encode_move(move['from_pos'], move['to_pos'], move.get('promotion_piece'), flags)
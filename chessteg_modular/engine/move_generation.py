@@ -3,9 +3,16 @@ Chessteg Move Generation Module - KORRIGIERTE VERSION MIT DEBUG
 Vollständige Zuggenerierung mit allen Schachregeln
 """
 
-import copy
 from typing import List, Dict, Any, Optional
 
+from bitboard import (SQ64, SQ120, RANK_MASKS, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS,
+                      iter_bits, rook_attacks, bishop_attacks, queen_attacks)
+from tables import (KNIGHT_TARGETS, KING_TARGETS, PAWN_CAPTURES, ROOK_RAYS, BISHOP_RAYS,
+                    SLIDER_RAYS, ROOK_DIRECTIONS, BISHOP_DIRECTIONS)
+from move_encoding import (encode_move, move_from, move_to_dict, move_from_dict,
+                           FLAG_CAPTURE, FLAG_EN_PASSANT, FLAG_CASTLING, FLAG_DOUBLE_PUSH,
+                           SQUARE_MASK, TO_SHIFT)
+
 # Konstanten für Figurentypen (aus Core Engine)
 PAWN = 1
 KNIGHT = 4
@@ -15,6 +22,8 @@ QUEEN = 9
 KING = 99
 WHITE = 1
 BLACK = -1
+EMPTY = 0
+DUMMY = 100
 
 # Richtungen für 10x10 Board
 DIRECTIONS = {
@@ -25,6 +34,11 @@ DIRECTIONS = {
 # Springer-Züge (L-Form)
 KNIGHT_MOVES = [21, 19, 12, 8, -8, -12, -19, -21]
 
+# Zugarten für die stufenweise Generierung (MovePicker, Quiescence)
+GEN_ALL = 0       # alle Pseudo-Züge
+GEN_TACTICAL = 1  # nur Schlagzüge (inkl. en Passant) und Umwandlungen
+GEN_QUIET = 2     # nur ruhige Züge (inkl. Rochade, ohne Umwandlungen)
+
 
 class MoveGenerator:
     """
@@ -44,205 +58,366 @@ class MoveGenerator:
         Returns:
             List[Dict]: Liste der legalen Züge
         """
-        all_moves = []
+        engine = self.engine
+        return [move_to_dict(engine, move) for move in self.generate_packed_moves(color)]
+
+    def generate_packed_moves(self, color: int) -> List[int]:
+        """
+        Generiert alle legalen Züge als gepackte Integer (siehe move_encoding).
+        Dies ist die Variante für Suche und Legalitätsprüfung.
+        """
+        masks = self.compute_legality_masks(color)
         
-        for piece in self.engine.pieces:
-            if not piece['captured'] and piece['color'] == color:
-                piece_moves = self.generate_piece_moves(piece)
-                all_moves.extend(piece_moves)
+        # Im Schach: nur Fluchtzüge, Schlagen des Angreifers und Dazwischenziehen
+        if masks is not None and masks[1]:
+            return self.generate_evasions(color, masks)
         
-        # Spezielle Züge hinzufügen
-        special_moves = self._generate_special_moves(color)
-        all_moves.extend(special_moves)
+        all_moves = self.generate_pseudo_legal_moves(color)
         
         # Nur legale Züge zurückgeben (ohne Selbstschach)
-        legal_moves = [move for move in all_moves if self.is_move_legal(move)]
+        return self.filter_legal_moves(all_moves, color, masks)
+
+    def filter_legal_moves(self, all_moves: List[int], color: int, masks) -> List[int]:
+        """
+        Filtert Pseudo-Züge mit den Masken aus compute_legality_masks.
+        Die Masken werden einmal pro Stellung berechnet und können für
+        mehrere Teillisten (Zugstufen) wiederverwendet werden.
+        """
+        is_legal = self.is_packed_move_legal
+        if masks is None:
+            # Kein (oder mehr als ein) König - nur mit Ausführen und Prüfen
+            return [move for move in all_moves if is_legal(move, color)]
         
-        # DEBUG: Zeige Anzahl der generierten Züge
-        # print(f"Generierte legale Züge für {color}: {len(legal_moves)}")
+        king_pos, checkers, check_mask, pins = masks
+        legal_moves = []
+        for move in all_moves:
+            from_pos = move & SQUARE_MASK
+            
+            # Königszüge: Zielfeld kann angegriffen sein -> ausführen und prüfen
+            # (Rochaden hat validate_castling bereits vollständig geprüft)
+            if from_pos == king_pos:
+                if move & FLAG_CASTLING or is_legal(move, color):
+                    legal_moves.append(move)
+                continue
+            
+            # Doppelschach: nur der König darf ziehen
+            if checkers > 1:
+                continue
+            
+            # En Passant entfernt zwei Figuren aus einer Reihe -> ausführen und prüfen
+            if move & FLAG_EN_PASSANT:
+                if is_legal(move, color):
+                    legal_moves.append(move)
+                continue
+            
+            to_pos = (move >> TO_SHIFT) & SQUARE_MASK
+            # Schach: Angreifer schlagen oder den Strahl blockieren
+            if check_mask is not None and to_pos not in check_mask:
+                continue
+            # Gefesselte Figur: nur entlang der Fesselungslinie
+            pin_ray = pins.get(from_pos)
+            if pin_ray is not None and to_pos not in pin_ray:
+                continue
+            legal_moves.append(move)
         
         return legal_moves
 
+    def compute_legality_masks(self, color: int):
+        """
+        Bestimmt einmal pro Stellung Schachgeber und Fesselungen der Farbe.
+
+        Returns:
+            (Königsfeld, Anzahl Schachgeber, Schachmaske, Fesselungen) oder None,
+            wenn die Farbe nicht genau einen König hat.
+            Schachmaske: Felder, auf denen ein Zug das Schach aufhebt
+            (Angreifer plus Zwischenfelder), None ohne Schach.
+            Fesselungen: Feld der gefesselten Figur -> erlaubte Zielfelder.
+        """
+        engine = self.engine
+        if len(engine.piece_lists[color][KING]) != 1:
+            return None
+        king_pos = engine.get_king(color).position
+        board = engine.board
+        enemy = -color
+        enemy_queen = QUEEN * enemy
+        checkers = 0
+        check_mask = None
+        pins = {}
+
+        # Gleitende Figuren: je Strahl bis zur zweiten Figur laufen
+        for slider_type, rays in ((ROOK, ROOK_RAYS[king_pos]), (BISHOP, BISHOP_RAYS[king_pos])):
+            enemy_slider = slider_type * enemy
+            for ray in rays:
+                pinned_pos = None
+                for index, field in enumerate(ray):
+                    value = board[field]
+                    if value == EMPTY:
+                        continue
+                    if value * color > 0:
+                        # Eigene Figur: möglicherweise gefesselt
+                        if pinned_pos is not None:
+                            break
+                        pinned_pos = field
+                        continue
+                    if value == enemy_slider or value == enemy_queen:
+                        if pinned_pos is None:
+                            checkers += 1
+                            check_mask = set(ray[:index + 1])
+                        else:
+                            pins[pinned_pos] = set(ray[:index + 1])
+                    break
+
+        # Springer und Bauern geben Schach nur vom Feld aus, das geschlagen werden muss
+        enemy_knight = KNIGHT * enemy
+        for field in KNIGHT_TARGETS[king_pos]:
+            if board[field] == enemy_knight:
+                checkers += 1
+                check_mask = {field}
+        enemy_pawn = PAWN * enemy
+        for field in PAWN_CAPTURES[color][king_pos]:
+            if board[field] == enemy_pawn:
+                checkers += 1
+                check_mask = {field}
+
+        return king_pos, checkers, check_mask, pins
+
+    def generate_evasions(self, color: int, masks) -> List[int]:
+        """
+        Legale Züge, wenn die Farbe im Schach steht (masks aus
+        compute_legality_masks mit mindestens einem Schachgeber).
+
+        Erzeugt nur Königszüge, Schlagen des Schachgebers und Dazwischenziehen
+        auf dem Schachstrahl; bei Doppelschach nur Königszüge. Die Züge werden
+        rückwärts vom Zielfeld aus gesucht (wie is_square_attacked), statt
+        alle Pseudo-Züge zu erzeugen und einzeln zu prüfen.
+        """
+        engine = self.engine
+        board = engine.board
+        king_pos, checkers, check_mask, pins = masks
+        enemy = -color
+        moves = []
+
+        # 1. Königszüge: Angriffe ohne den König prüfen (sonst deckt er
+        #    die Felder hinter sich auf dem Schachstrahl)
+        king_value = board[king_pos]
+        board[king_pos] = EMPTY
+        for target_pos in KING_TARGETS[king_pos]:
+            value = board[target_pos]
+            if value * color > 0 or self.is_square_attacked(target_pos, enemy):
+                continue
+            move = king_pos | (target_pos << TO_SHIFT)
+            moves.append(move | FLAG_CAPTURE if value != EMPTY else move)
+        board[king_pos] = king_value
+
+        # Doppelschach: nur der König darf ziehen
+        if checkers > 1:
+            return moves
+
+        # 2. Schlagen des Schachgebers bzw. Dazwischenziehen
+        #    (gefesselte Figuren können ein Schach nie aufheben)
+        own_knight = KNIGHT * color
+        own_pawn = PAWN * color
+        own_queen = QUEEN * color
+        forward = 10 * color
+        for target_pos in check_mask:
+            is_checker = board[target_pos] != EMPTY
+            flags = FLAG_CAPTURE if is_checker else 0
+            to_bits = target_pos << TO_SHIFT
+
+            for field in KNIGHT_TARGETS[target_pos]:
+                if board[field] == own_knight and field not in pins:
+                    moves.append(field | to_bits | flags)
+
+            for own_slider, directions in ((ROOK * color, ROOK_DIRECTIONS),
+                                           (BISHOP * color, BISHOP_DIRECTIONS)):
+                for direction in directions:
+                    field = target_pos + direction
+                    value = board[field]
+                    while value == EMPTY:
+                        field += direction
+                        value = board[field]
+                    if (value == own_slider or value == own_queen) and field not in pins:
+                        moves.append(field | to_bits | flags)
+
+            # Bauern: schlagen diagonal, ziehen nur geradeaus dazwischen
+            pawn_sources = []
+            if is_checker:
+                for field in PAWN_CAPTURES[enemy][target_pos]:
+                    if board[field] == own_pawn:
+                        pawn_sources.append((field, FLAG_CAPTURE))
+            else:
+                field = target_pos - forward
+                if board[field] == own_pawn:
+                    pawn_sources.append((field, 0))
+                elif (board[field] == EMPTY and board[field - forward] == own_pawn
+                      and (field - forward) // 10 == (3 if color == WHITE else 8)):
+                    pawn_sources.append((field - forward, FLAG_DOUBLE_PUSH))
+            for field, pawn_flags in pawn_sources:
+                if field in pins:
+                    continue
+                if self._is_promotion_rank(target_pos, color):
+                    for p_type in [QUEEN, ROOK, BISHOP, KNIGHT]:
+                        moves.append(encode_move(field, target_pos, p_type, pawn_flags))
+                else:
+                    moves.append(field | to_bits | pawn_flags)
+
+        # 3. En Passant: schlägt den Schach gebenden Bauern oder blockiert
+        #    auf dem en Passant Feld - selten, daher ausführen und prüfen
+        en_passant_target = engine.rules.en_passant_target
+        if en_passant_target:
+            for field in PAWN_CAPTURES[enemy][en_passant_target]:
+                if board[field] == own_pawn:
+                    move = encode_move(field, en_passant_target, flags=FLAG_EN_PASSANT)
+                    if self.is_packed_move_legal(move, color):
+                        moves.append(move)
+
+        return moves
+
+    def generate_pseudo_legal_moves(self, color: int, kind: int = GEN_ALL) -> List[int]:
+        """
+        Generiert Züge ohne Selbstschach-Prüfung als gepackte Integer.
+        
+        Args:
+            color: Farbe (1=weiß, -1=schwarz)
+            kind: GEN_ALL, GEN_TACTICAL (Schläge/Umwandlungen) oder GEN_QUIET
+        """
+        if self.engine.bitboards is not None:
+            return self._generate_bitboard_moves(color, kind)
+        
+        all_moves = []
+        
+        for pieces in self.engine.piece_lists[color].values():
+            for piece in pieces:
+                self._add_piece_moves(piece, all_moves, kind)
+        
+        # Spezielle Züge hinzufügen
+        if kind != GEN_TACTICAL:
+            self._add_castling_moves(color, all_moves)
+        
+        return all_moves
+
     def generate_legal_moves(self, color: int) -> List[Dict[str, Any]]:
         """Generiert legale Züge - Alias für generate_moves für Kompatibilität."""
         return self.generate_moves(color)
 
     def generate_active_moves(self, color: int) -> List[Dict[str, Any]]:
         """Generiert nur aktive Züge (Schläge) für Quiescence Search."""
-        all_moves = self.generate_moves(color)
-        active_moves = []
-        
-        for move in all_moves:
-            # Schlagzüge und Bauernumwandlungen als "aktiv" betrachten
-            if (move.get('capture_pos') or 
-                move.get('special_type') == 'en_passant' or
-                move.get('promotion_piece')):
-                active_moves.append(move)
-        
-        return active_moves
+        engine = self.engine
+        return [move_to_dict(engine, move) for move in self.generate_tactical_moves(color)]
 
-    def is_move_legal(self, move: Dict[str, Any]) -> bool:
+    def generate_tactical_moves(self, color: int) -> List[int]:
+        """
+        Legale Schlagzüge (inkl. en Passant) und Umwandlungen als gepackte
+        Integer. Ruhige Züge werden gar nicht erst generiert (Quiescence).
+        """
+        tactical_moves = self.generate_pseudo_legal_moves(color, GEN_TACTICAL)
+        if not tactical_moves:
+            return tactical_moves
+        return self.filter_legal_moves(tactical_moves, color, self.compute_legality_masks(color))
+
+    def is_move_legal(self, move) -> bool:
         """
         Prüft, ob ein Zug legal ist (König nicht im Schach nach dem Zug)
         
         Args:
-            move: Der Zug im Diktionär-Format
+            move: Der Zug im Diktionär-Format oder als gepackter Integer
             
         Returns:
             bool: True wenn der Zug legal ist
         """
-        piece_id = move['piece_id']
-        piece = self.engine.get_piece_by_id(piece_id)
+        if not isinstance(move, int):
+            move = move_from_dict(move)
         
+        piece = self.engine.get_piece_at(move_from(move))
         if not piece:
             return False
-            
-        color = piece['color']
         
-        # Führe den Zug temporär aus
-        snapshot = self.engine.take_snapshot()
+        return self.is_packed_move_legal(move, piece.color)
+
+    def is_packed_move_legal(self, move: int, color: int) -> bool:
+        """Legalitätsprüfung für einen gepackten Zug der angegebenen Farbe."""
+        engine = self.engine
         
-        # Verwende die niedrigstufige Methode, um den Zug durchzuführen,
-        # ohne die white_turn-Variable zu ändern.
-        self.engine._apply_move_internal(move)
+        # Führe den Zug temporär aus (inkrementell, ohne Spielende-Prüfung)
+        record = engine._apply_move_internal(move)
+        if record is None:
+            return False
         
-        is_legal = not self.engine.is_king_in_check(color)
+        is_legal = not engine.is_king_in_check(color)
         
-        # Mache den Zug rückgängig
-        self.engine.restore_snapshot(snapshot)
+        # Mache den Zug exakt rückgängig
+        engine._undo_move_internal(record)
         
         return is_legal
 
-    def _generate_special_moves(self, color: int) -> List[Dict[str, Any]]:
+    def is_pseudo_legal(self, move: int, color: int) -> bool:
         """
-        Generiert Rochade und Bauernumwandlungen - KORRIGIERTE VERSION
+        Prüft, ob ein gespeicherter Zug (Hash-Zug, Killer) in der aktuellen
+        Stellung als Pseudo-Zug der Farbe generiert würde.
         """
-        special_moves = []
+        piece = self.engine.get_piece_at(move & SQUARE_MASK)
+        if piece is None or piece.color != color:
+            return False
         
-        # Rochade-Züge
+        moves = []
+        if move & FLAG_CASTLING:
+            self._add_castling_moves(color, moves)
+        else:
+            self._add_piece_moves(piece, moves)
+        return move in moves
+
+    def _generate_special_moves(self, color: int) -> List[Dict[str, Any]]:
+        """
+        Generiert Rochaden im Diktionär-Format - KORRIGIERTE VERSION
+        """
+        moves = []
+        self._add_castling_moves(color, moves)
+        return [move_to_dict(self.engine, move) for move in moves]
+
+    def _add_castling_moves(self, color: int, moves: List[int]):
+        """
+        Fügt die legalen Rochaden als gepackte Züge hinzu
+        """
         rules = self.engine.rules
+        king_pos = 25 if color == WHITE else 95  # e1 / e8
         
-        # Kleine Rochade
-        if rules.validate_castling(color, 'kingside'):
-            if color == WHITE:
-                king_pos = 25  # e1
-                king_to = 27   # g1
-                rook_pos = 28  # h1  
-                rook_to = 26   # f1
-            else:
-                king_pos = 95  # e8
-                king_to = 97   # g8
-                rook_pos = 98  # h8
-                rook_to = 96   # f8
-            
-            king = self.engine.get_piece_at(king_pos)
-            rook = self.engine.get_piece_at(rook_pos)
-            
-            if king and king['type'] == KING and rook and rook['type'] == ROOK:
-                special_moves.append({
-                    'piece_id': king['id'],
-                    'piece': king,  # 🚨 WICHTIG: Füge piece-Objekt hinzu
-                    'type': KING,   # 🚨 WICHTIG: Explizit setzen
-                    'color': color, # 🚨 WICHTIG: Explizit setzen
-                    'from_pos': king_pos,
-                    'to_pos': king_to,
-                    'capture_pos': None,
-                    'promotion_piece': None,
-                    'special_type': 'castling',
-                    'rook_id': rook['id'],
-                    'rook_from': rook_pos,
-                    'rook_to': rook_to
-                })
-        
-        # Große Rochade
-        if rules.validate_castling(color, 'queenside'):
-            if color == WHITE:
-                king_pos = 25  # e1
-                king_to = 23   # c1
-                rook_pos = 21  # a1  
-                rook_to = 24   # d1
-            else:
-                king_pos = 95  # e8
-                king_to = 93   # c8
-                rook_pos = 91  # a8
-                rook_to = 94   # d8
-                
-            king = self.engine.get_piece_at(king_pos)
-            rook = self.engine.get_piece_at(rook_pos)
-            
-            if king and king['type'] == KING and rook and rook['type'] == ROOK:
-                special_moves.append({
-                    'piece_id': king['id'],
-                    'piece': king,  # 🚨 WICHTIG
-                    'type': KING,   # 🚨 WICHTIG  
-                    'color': color, # 🚨 WICHTIG
-                    'from_pos': king_pos,
-                    'to_pos': king_to,
-                    'capture_pos': None,
-                    'promotion_piece': None,
-                    'special_type': 'castling',
-                    'rook_id': rook['id'],
-                    'rook_from': rook_pos,
-                    'rook_to': rook_to
-                })
-        
-        return special_moves
-
-    def generate_piece_moves(self, piece: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Kleine Rochade (König nach g1/g8) und große Rochade (nach c1/c8)
+        for side, king_to in (('kingside', king_pos + 2), ('queenside', king_pos - 2)):
+            if rules.validate_castling(color, side):
+                moves.append(encode_move(king_pos, king_to, flags=FLAG_CASTLING))
+
+    def generate_piece_moves(self, piece) -> List[Dict[str, Any]]:
         """
         Generiert alle möglichen Züge für eine einzelne Figur (ohne Legalitätsprüfung)
         """
-        piece_type = piece['type']
+        engine = self.engine
+        return [move_to_dict(engine, move) for move in self.generate_piece_moves_packed(piece)]
+
+    def generate_piece_moves_packed(self, piece) -> List[int]:
+        """Wie generate_piece_moves, aber als gepackte Integer."""
+        moves = []
+        self._add_piece_moves(piece, moves)
+        return moves
+
+    def _add_piece_moves(self, piece, moves: List[int], kind: int = GEN_ALL):
+        """Fügt die Pseudo-Züge einer Figur an die Liste an."""
+        piece_type = piece.type
         
         if piece_type == PAWN:
-            return self._generate_pawn_moves(piece)
-        elif piece_type == ROOK:
-            return self._generate_sliding_moves(piece, ['N', 'S', 'E', 'W'])
-        elif piece_type == BISHOP:
-            return self._generate_sliding_moves(piece, ['NE', 'NW', 'SE', 'SW'])
-        elif piece_type == QUEEN:
-            return self._generate_sliding_moves(piece, list(DIRECTIONS.keys()))
+            self._generate_pawn_moves(piece, moves, kind)
+        elif piece_type == ROOK or piece_type == BISHOP or piece_type == QUEEN:
+            self._generate_sliding_moves(piece, SLIDER_RAYS[piece_type][piece.position], moves, kind)
         elif piece_type == KNIGHT:
-            return self._generate_knight_moves(piece)
+            self._generate_knight_moves(piece, moves, kind)
         elif piece_type == KING:
-            return self._generate_king_moves(piece)
-            
-        return []
-
-    def _create_move(self, piece: Dict[str, Any], to_pos: int, capture_pos: Optional[int] = None, 
-                    special_type: Optional[str] = None, promotion_piece: Optional[int] = None) -> Dict[str, Any]:
-        """
-        Erstellt ein standardisiertes Zug-Diktionär - KORRIGIERTE VERSION
-        """
-        move_dict = {
-            'piece_id': piece['id'],
-            'piece': piece,
-            'type': piece['type'],        # 🚨 KRITISCH: Figurentyp
-            'color': piece['color'],      # 🚨 KRITISCH: Farbe
-            'from_pos': piece['position'],
-            'to_pos': to_pos,
-            'capture_pos': capture_pos,
-            'promotion_piece': promotion_piece,
-            'special_type': special_type
-        }
-        
-        # Markiere Schlagzüge für Move Ordering
-        if capture_pos is not None:
-            move_dict['is_capture'] = True
-            
-        # 🚨 NEU: Setze promotion_type falls promotion_piece vorhanden
-        if promotion_piece is not None:
-            move_dict['promotion_type'] = promotion_piece
-            
-        return move_dict
+            self._generate_king_moves(piece, moves, kind)
 
-    def _generate_pawn_moves(self, pawn: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_pawn_moves(self, pawn, moves: List[int], kind: int = GEN_ALL):
         """
         Generiert Züge für einen Bauern
         """
-        moves = []
-        color = pawn['color']
-        start_pos = pawn['position']
+        color = pawn.color
+        start_pos = pawn.position
         
         # Die Richtung, in die der Bauer zieht
         forward = DIRECTIONS['N'] * color
@@ -261,48 +436,40 @@ class MoveGenerator:
             # KORREKTUR: Eigene Implementierung für Promotions-Prüfung
             if self._is_promotion_rank(one_step, color):
                 # Füge alle Promotion-Züge (Dame, Turm, Läufer, Springer) hinzu
-                for p_type in [QUEEN, ROOK, BISHOP, KNIGHT]:
-                    moves.append(self._create_move(pawn, one_step, promotion_piece=p_type))
-            else:
-                moves.append(self._create_move(pawn, one_step))
+                if kind != GEN_QUIET:
+                    for p_type in [QUEEN, ROOK, BISHOP, KNIGHT]:
+                        moves.append(encode_move(start_pos, one_step, p_type))
+            elif kind != GEN_TACTICAL:
+                moves.append(encode_move(start_pos, one_step))
 
                 # =========================================================================
                 # 2. Vorwärtszug (Zwei Felder)
                 # =========================================================================
-                if pawn['position'] // 10 == start_row:
+                if start_pos // 10 == start_row:
                     two_step = start_pos + 2 * forward
                     if self.engine.get_piece_at(two_step) is None:
-                        moves.append(self._create_move(pawn, two_step, special_type='double_pawn_push'))
+                        moves.append(encode_move(start_pos, two_step, flags=FLAG_DOUBLE_PUSH))
 
         # =========================================================================
         # 3. Schlagzüge (Diagonal)
         # =========================================================================
-        capture_dirs = [forward + DIRECTIONS['E'], forward + DIRECTIONS['W']]
-        
-        for capture_dir in capture_dirs:
-            target_pos = start_pos + capture_dir
-            if not self.engine.is_valid_position(target_pos):
-                continue
-                
+        if kind == GEN_QUIET:
+            return
+        for target_pos in PAWN_CAPTURES[color][start_pos]:
             target_piece = self.engine.get_piece_at(target_pos)
             
             # Normaler Schlagzug
-            if target_piece and target_piece['color'] != color:
+            if target_piece and target_piece.color != color:
                 if self._is_promotion_rank(target_pos, color):
                     # Promotion-Schlagzug
                     for p_type in [QUEEN, ROOK, BISHOP, KNIGHT]:
-                        moves.append(self._create_move(pawn, target_pos, target_pos, promotion_piece=p_type))
+                        moves.append(encode_move(start_pos, target_pos, p_type, FLAG_CAPTURE))
                 else:
-                    moves.append(self._create_move(pawn, target_pos, target_pos))
+                    moves.append(encode_move(start_pos, target_pos, flags=FLAG_CAPTURE))
             
-            # En Passant
+            # En Passant (das geschlagene Bauernfeld liegt eine Reihe hinter dem Ziel)
             elif target_pos == self.engine.rules.en_passant_target:
-                # Das geschlagene Bauernfeld ist immer 10 Schritte (eine Reihe) hinter dem Ziel
-                captured_pawn_pos = target_pos - forward 
-                
-                moves.append(self._create_move(pawn, target_pos, captured_pawn_pos, special_type='en_passant'))
-                
-        return moves
+                moves.append(encode_move(start_pos, target_pos, flags=FLAG_EN_PASSANT))
 
     def _is_promotion_rank(self, position: int, color: int) -> bool:
         """
@@ -312,78 +479,135 @@ class MoveGenerator:
         # Weißer Bauer auf 8. Reihe (Row 9) oder schwarzer Bauer auf 1. Reihe (Row 2)
         return (color == WHITE and row == 9) or (color == BLACK and row == 2)
 
-    def _generate_knight_moves(self, piece: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_knight_moves(self, piece, moves: List[int], kind: int = GEN_ALL):
         """
         Generiert Züge für einen Springer
         """
-        moves = []
-        current_pos = piece['position'] # KORREKTUR: Verwende 'position'
-        color = piece['color']
-        
-        for move in KNIGHT_MOVES:
-            target_pos = current_pos + move
-            if self.engine.is_valid_position(target_pos):
-                target_piece = self.engine.get_piece_at(target_pos)
-                
-                if target_piece is None:
-                    # Leeres Feld
-                    moves.append(self._create_move(piece, target_pos))
-                elif target_piece['color'] != color:
-                    # Schlagzug
-                    moves.append(self._create_move(piece, target_pos, target_pos))
-                    
-        return moves
+        current_pos = piece.position # KORREKTUR: Verwende 'position'
+        self._generate_step_moves(current_pos, piece.color, KNIGHT_TARGETS[current_pos], moves, kind)
 
-    def _generate_king_moves(self, piece: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_king_moves(self, piece, moves: List[int], kind: int = GEN_ALL):
         """
-        Generiert Züge für den König (Rochade wird separat in _generate_special_moves behandelt)
+        Generiert Züge für den König (Rochade wird separat in _add_castling_moves behandelt)
         """
-        moves = []
-        current_pos = piece['position'] # KORREKTUR: Verwende 'position'
-        color = piece['color']
-        
-        for direction in DIRECTIONS.values():
-            target_pos = current_pos + direction
-            if self.engine.is_valid_position(target_pos):
-                target_piece = self.engine.get_piece_at(target_pos)
-                
-                if target_piece is None:
-                    # Leeres Feld
-                    moves.append(self._create_move(piece, target_pos))
-                elif target_piece['color'] != color:
-                    # Schlagzug
-                    moves.append(self._create_move(piece, target_pos, target_pos))
-                    
-        return moves
+        current_pos = piece.position # KORREKTUR: Verwende 'position'
+        self._generate_step_moves(current_pos, piece.color, KING_TARGETS[current_pos], moves, kind)
 
-    def _generate_sliding_moves(self, piece: Dict[str, Any], directions: List[str]) -> List[Dict[str, Any]]:
+    def _generate_step_moves(self, current_pos: int, color: int, targets, moves: List[int],
+                             kind: int = GEN_ALL):
+        """Züge auf vorberechnete Zielfelder (Springer, König)"""
+        board = self.engine.board
+        quiets = kind != GEN_TACTICAL
+        captures = kind != GEN_QUIET
+        for target_pos in targets:
+            value = board[target_pos]
+            if value == EMPTY:
+                # Leeres Feld
+                if quiets:
+                    moves.append(current_pos | (target_pos << TO_SHIFT))
+            elif value * color < 0 and captures:
+                # Schlagzug
+                moves.append(current_pos | (target_pos << TO_SHIFT) | FLAG_CAPTURE)
+
+    def _generate_sliding_moves(self, piece, rays, moves: List[int], kind: int = GEN_ALL):
         """
         Generiert Züge für gleitende Figuren (Dame, Turm, Läufer)
+        entlang der vorberechneten Strahlen (siehe tables.SLIDER_RAYS)
         """
-        moves = []
-        current_pos = piece['position'] # KORREKTUR: Verwende 'position'
-        color = piece['color']
-        
-        for direction_str in directions:
-            direction = DIRECTIONS[direction_str]
-            field = current_pos + direction
-            
-            while self.engine.is_valid_position(field):
-                target_piece = self.engine.get_piece_at(field)
+        current_pos = piece.position # KORREKTUR: Verwende 'position'
+        color = piece.color
+        board = self.engine.board
+        quiets = kind != GEN_TACTICAL
+        captures = kind != GEN_QUIET
+        
+        for ray in rays:
+            for field in ray:
+                value = board[field]
                 
-                if target_piece is None:
+                if value == EMPTY:
                     # Leeres Feld: Zug hinzufügen und weiter in diese Richtung
-                    moves.append(self._create_move(piece, field))
-                elif target_piece['color'] != color:
+                    if quiets:
+                        moves.append(current_pos | (field << TO_SHIFT))
+                elif value * color < 0:
                     # Gegnerische Figur: Schlagzug hinzufügen und Schleife beenden
-                    moves.append(self._create_move(piece, field, field))
+                    if captures:
+                        moves.append(current_pos | (field << TO_SHIFT) | FLAG_CAPTURE)
                     break
                 else:
                     # Eigene Figur: Blockiert, Schleife beenden
                     break
-                    
-                field += direction
-                
+
+    # =========================================================================
+    # BITBOARD-BACKEND
+    # =========================================================================
+
+    def _generate_bitboard_moves(self, color: int, kind: int = GEN_ALL) -> List[int]:
+        """
+        Pseudo-legale Zuggenerierung über die Bitboards der Engine
+        (gleiche gepackte Züge wie die Mailbox-Generierung)
+        """
+        bitboards = self.engine.bitboards
+        pieces = bitboards.pieces
+        own = bitboards.occupied[color]
+        enemy = bitboards.occupied[-color]
+        occupied = own | enemy
+        # Zielmasken je Zugart (Umwandlungen zählen immer als taktisch)
+        capture_targets = enemy if kind != GEN_QUIET else 0
+        quiet_targets = ~occupied if kind != GEN_TACTICAL else 0
+        moves = []
+        append = moves.append
+
+        # Bauern
+        forward = 8 * color
+        start_rank = RANK_MASKS[1] if color == WHITE else RANK_MASKS[6]
+        promotion_rank = RANK_MASKS[7] if color == WHITE else RANK_MASKS[0]
+        pawn_attacks = PAWN_ATTACKS[color]
+        en_passant_target = self.engine.rules.en_passant_target
+        en_passant_bit = 1 << SQ64[en_passant_target] if en_passant_target else 0
+        for sq in iter_bits(pieces[PAWN * color]):
+            from_pos = SQ120[sq]
+            targets = []
+            one_step = sq + forward
+            if not occupied & (1 << one_step):
+                if (1 << one_step) & promotion_rank:
+                    if kind != GEN_QUIET:
+                        targets.append((one_step, 0))
+                elif kind != GEN_TACTICAL:
+                    targets.append((one_step, 0))
+                    if (1 << sq) & start_rank and not occupied & (1 << (one_step + forward)):
+                        append(encode_move(from_pos, SQ120[one_step + forward], flags=FLAG_DOUBLE_PUSH))
+            for target in iter_bits(pawn_attacks[sq] & capture_targets):
+                targets.append((target, FLAG_CAPTURE))
+            if pawn_attacks[sq] & en_passant_bit and kind != GEN_QUIET:
+                append(encode_move(from_pos, en_passant_target, flags=FLAG_EN_PASSANT))
+            for target, flags in targets:
+                if (1 << target) & promotion_rank:
+                    for p_type in [QUEEN, ROOK, BISHOP, KNIGHT]:
+                        append(encode_move(from_pos, SQ120[target], p_type, flags))
+                else:
+                    append(encode_move(from_pos, SQ120[target], flags=flags))
+
+        # Springer, Läufer, Türme, Damen, König
+        for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            for sq in iter_bits(pieces[piece_type * color]):
+                from_pos = SQ120[sq]
+                if piece_type == KNIGHT:
+                    attacks = KNIGHT_ATTACKS[sq]
+                elif piece_type == BISHOP:
+                    attacks = bishop_attacks(sq, occupied)
+                elif piece_type == ROOK:
+                    attacks = rook_attacks(sq, occupied)
+                elif piece_type == QUEEN:
+                    attacks = queen_attacks(sq, occupied)
+                else:
+                    attacks = KING_ATTACKS[sq]
+                for target in iter_bits(attacks & capture_targets):
+                    append(encode_move(from_pos, SQ120[target], flags=FLAG_CAPTURE))
+                for target in iter_bits(attacks & quiet_targets):
+                    append(encode_move(from_pos, SQ120[target]))
+
+        if kind != GEN_TACTICAL:
+            self._add_castling_moves(color, moves)
         return moves
 
     def get_attacked_squares(self, piece: Dict[str, Any]) -> List[int]:
@@ -391,61 +615,33 @@ class MoveGenerator:
         Gibt eine Liste aller Felder zurück, die von einer bestimmten Figur angegriffen werden.
         Wird für die Schachprüfung verwendet.
         """
-        piece_type = piece['type']
+        piece_type = piece.type
         attacked_squares = []
         
         # KORREKTUR: Die Position der Figur ist IMMER 'position', NICHT 'pos'.
-        current_pos = piece['position']
-        color = piece['color']
+        current_pos = piece.position
+        color = piece.color
 
         if piece_type == PAWN:
-            forward = DIRECTIONS['N'] * color
             # Bauern-Angriffszüge sind diagonal (keine normalen Züge)
-            capture_dirs = [forward + DIRECTIONS['E'], forward + DIRECTIONS['W']]
-            
-            for capture_dir in capture_dirs:
-                target_pos = current_pos + capture_dir
-                if self.engine.is_valid_position(target_pos):
-                    # Nur die Angriffsfelder zurückgeben, unabhängig davon, ob eine Figur dort steht
-                    attacked_squares.append(target_pos)
+            # Nur die Angriffsfelder zurückgeben, unabhängig davon, ob eine Figur dort steht
+            attacked_squares.extend(PAWN_CAPTURES[color][current_pos])
                     
         elif piece_type == KNIGHT:
-            for move in KNIGHT_MOVES:
-                target_pos = current_pos + move
-                if self.engine.is_valid_position(target_pos):
-                    attacked_squares.append(target_pos)
+            attacked_squares.extend(KNIGHT_TARGETS[current_pos])
                     
         elif piece_type == KING:
-            for direction in DIRECTIONS.values():
-                target_pos = current_pos + direction
-                if self.engine.is_valid_position(target_pos):
-                    attacked_squares.append(target_pos)
+            attacked_squares.extend(KING_TARGETS[current_pos])
                     
         elif piece_type in [ROOK, BISHOP, QUEEN]:
-            if piece_type == ROOK:
-                directions = ['N', 'S', 'E', 'W']
-            elif piece_type == BISHOP:
-                directions = ['NE', 'NW', 'SE', 'SW']
-            else: # QUEEN
-                directions = list(DIRECTIONS.keys())
-                
-            for direction_str in directions:
-                direction = DIRECTIONS[direction_str]
-                field = current_pos + direction
-                
-                # Dies ist der Teil, der im Traceback (Zeile 642) den Fehler verursachte, 
-                # wenn er in einer Unterfunktion fälschlicherweise 'pos' verwendete.
-                # Hier ist die Korrektur: Die Startposition ist current_pos = piece['position'].
-                
-                while self.engine.is_valid_position(field):
+            board = self.engine.board
+            for ray in SLIDER_RAYS[piece_type][current_pos]:
+                for field in ray:
                     attacked_squares.append(field)
-                    target_piece = self.engine.get_piece_at(field)
                     
                     # Bei Angriffsgenerierung stoppen wir nur, wenn wir auf eine Figur treffen
-                    if target_piece is not None:
+                    if board[field] != EMPTY:
                         break
-                        
-                    field += direction
         
         return attacked_squares
         
@@ -460,15 +656,46 @@ class MoveGenerator:
         Returns:
             bool: True wenn Feld angegriffen wird
         """
-        for piece in self.engine.pieces:
-            if (piece['captured'] or 
-                piece['color'] != attacker_color):
-                continue
-            
-            attacked_squares = self.get_attacked_squares(piece)
-            if position in attacked_squares:
+        # Rückwärtssuche vom Zielfeld aus (wie `attakiert` im Pascal-Original):
+        # von jedem Feldtyp aus schauen, ob dort ein passender Angreifer steht.
+        # Das 10x12 Board wird immer mitgeführt, daher gilt diese Prüfung
+        # auch bei aktivem Bitboard-Backend (Bitboards prüft keine Angriffe).
+        board = self.engine.board
+        
+        # Springer (vonSpringerBedroht)
+        knight = KNIGHT * attacker_color
+        for field in KNIGHT_TARGETS[position]:
+            if board[field] == knight:
+                return True
+        
+        # Bauern (vonBauerBedroht): angreifende Bauern stehen auf den Schlagfeldern
+        # eines eigenen Bauern auf dem Zielfeld
+        pawn = PAWN * attacker_color
+        for field in PAWN_CAPTURES[-attacker_color][position]:
+            if board[field] == pawn:
                 return True
         
+        # König (vonKoenigBedroht)
+        king = KING * attacker_color
+        for field in KING_TARGETS[position]:
+            if board[field] == king:
+                return True
+        
+        # Türme/Läufer/Damen (vonTurmBedroht, vonLaeuferBedroht): Strahl bis zur ersten Figur.
+        # Hier läuft der Strahl direkt über das Board - der DUMMY-Rand beendet ihn
+        # ohne Grenzprüfung und ist bei frühem Abbruch schneller als ROOK_RAYS/BISHOP_RAYS
+        queen = QUEEN * attacker_color
+        for slider, directions in ((ROOK * attacker_color, ROOK_DIRECTIONS),
+                                   (BISHOP * attacker_color, BISHOP_DIRECTIONS)):
+            for direction in directions:
+                field = position + direction
+                value = board[field]
+                while value == EMPTY:
+                    field += direction
+                    value = board[field]
+                if value == slider or value == queen:
+                    return True
+        
         return False
 
 
@@ -489,7 +716,7 @@ if __name__ == "__main__":
     print(f"Castling moves available: {len(castling_moves)}")
     
     # Test: Springer-Züge
-    knights = [p for p in engine.pieces if p['type'] == 4 and p['color'] == 1]
+    knights = engine.get_pieces(1, 4)
     for knight in knights:
-        knight_moves = move_gen._generate_knight_moves(knight)
-        print(f"Knight at {engine._position_to_notation(knight['position'])} moves: {len(knight_moves)}")
+        knight_moves = move_gen.generate_piece_moves_packed(knight)
+        print(f"Knight at {engine._position_to_notation(knight.position)} moves: {len(knight_moves)}")
@@ -0,0 +1,195 @@
+"""
+Chessteg Move Picker Module
+Stufenweise, verzögerte Zugauswahl für die Alpha-Beta-Suche
+
+Reihenfolge der Stufen:
+    1. Hash-Zug (aus der Transpositionstabelle / Vorgängeriteration)
+    2. Gewinnende Schlagzüge nach MVV-LVA
+    3. Umwandlungen (Dame zuerst)
+    4. Killerzüge
+    5. Ruhige Züge (nach History-Heuristik sortiert)
+    6. Verlierende Schlagzüge
+
+Jede Stufe wird erst generiert und auf Legalität geprüft, wenn die Suche
+den nächsten Zug anfordert. Ein Beta-Schnitt nach dem Hash-Zug oder einem
+guten Schlagzug spart damit die Generierung aller ruhigen Züge.
+"""
+
+from typing import Iterator, List, Optional, Sequence
+
+from move_encoding import (NO_MOVE, SQUARE_MASK, TO_SHIFT, PROMOTION_SHIFT, PROMOTION_MASK,
+                           FLAG_CAPTURE, FLAG_EN_PASSANT)
+from move_generation import GEN_TACTICAL, GEN_QUIET
+
+PAWN = 1
+KNIGHT = 4
+BISHOP = 3
+ROOK = 5
+QUEEN = 9
+KING = 99
+
+# Figurenwerte für MVV-LVA (wie SearchAlgorithm.PIECE_VALUES)
+PIECE_VALUES = {
+    PAWN: 100,
+    KNIGHT: 320,
+    BISHOP: 330,
+    ROOK: 500,
+    QUEEN: 900,
+    KING: 20000
+}
+
+# =============================================================================
+# STUFEN
+# =============================================================================
+STAGE_HASH = 0
+STAGE_GOOD_CAPTURES = 1
+STAGE_PROMOTIONS = 2
+STAGE_KILLERS = 3
+STAGE_QUIETS = 4
+STAGE_BAD_CAPTURES = 5
+STAGE_DONE = 6
+
+# Schlagzüge und Umwandlungen
+TACTICAL_FLAGS = FLAG_CAPTURE | FLAG_EN_PASSANT | (PROMOTION_MASK << PROMOTION_SHIFT)
+
+
+class MovePicker:
+    """
+    Liefert die legalen Züge einer Stellung als Iterator in Stufen.
+
+    Die Stellung darf zwischen zwei Zügen verändert werden, solange sie vor
+    dem nächsten Zugriff wiederhergestellt ist (make/undo der Suche).
+    Das Attribut `stage` gibt die Stufe des zuletzt gelieferten Zuges an.
+
+    history: optionale History-Tabelle der Farbe (Index from * 120 + to),
+    nach der die ruhigen Züge absteigend sortiert werden.
+    """
+
+    def __init__(self, engine, color: int, hash_move: int = NO_MOVE,
+                 killers: Sequence[int] = (), history: Optional[List[int]] = None):
+        self.engine = engine
+        self.color = color
+        self.hash_move = hash_move
+        self.killers = killers
+        self.history = history
+        self.stage = STAGE_HASH
+        self._masks = None
+        self._masks_ready = False
+
+    def __iter__(self) -> Iterator[int]:
+        generator = self.engine.move_generator
+        color = self.color
+        hash_move = self.hash_move
+
+        # 1. Hash-Zug
+        self.stage = STAGE_HASH
+        if hash_move and generator.is_pseudo_legal(hash_move, color) and self._legal([hash_move]):
+            yield hash_move
+
+        # 2. Schlagzüge und Umwandlungen (gemeinsam generiert)
+        #    Im Schach liefert der Evasion-Generator alle Züge auf einmal
+        self.stage = STAGE_GOOD_CAPTURES
+        masks = self._legality_masks()
+        quiets = None
+        if masks is not None and masks[1]:
+            evasions = generator.generate_evasions(color, masks)
+            tactical = [move for move in evasions if move & TACTICAL_FLAGS]
+            quiets = [move for move in evasions if not move & TACTICAL_FLAGS]
+        else:
+            tactical = self._legal(generator.generate_pseudo_legal_moves(color, GEN_TACTICAL))
+        good_captures, promotions, bad_captures = self._split_tactical(tactical)
+        for move in good_captures:
+            if move != hash_move:
+                yield move
+
+        # 3. Umwandlungen
+        self.stage = STAGE_PROMOTIONS
+        for move in promotions:
+            if move != hash_move:
+                yield move
+
+        # 4. Killerzüge (nur ruhige Züge, die hier pseudo-legal sind)
+        self.stage = STAGE_KILLERS
+        yielded_killers = []
+        for move in self.killers:
+            if (move and move != hash_move and move not in yielded_killers
+                    and not move & TACTICAL_FLAGS
+                    and generator.is_pseudo_legal(move, color) and self._legal([move])):
+                yielded_killers.append(move)
+                yield move
+
+        # 5. Ruhige Züge
+        self.stage = STAGE_QUIETS
+        if quiets is None:
+            quiets = self._legal(generator.generate_pseudo_legal_moves(color, GEN_QUIET))
+        if self.history is not None and len(quiets) > 1:
+            history = self.history
+            quiets.sort(key=lambda move: history[(move & SQUARE_MASK) * 120 +
+                                                 ((move >> TO_SHIFT) & SQUARE_MASK)],
+                        reverse=True)
+        for move in quiets:
+            if move != hash_move and move not in yielded_killers:
+                yield move
+
+        # 6. Verlierende Schlagzüge
+        self.stage = STAGE_BAD_CAPTURES
+        for move in bad_captures:
+            if move != hash_move:
+                yield move
+
+        self.stage = STAGE_DONE
+
+    # =========================================================================
+    # HILFSFUNKTIONEN
+    # =========================================================================
+
+    def _legality_masks(self):
+        """Schach- und Fesselungsmasken, einmal pro Stellung berechnet."""
+        if not self._masks_ready:
+            self._masks = self.engine.move_generator.compute_legality_masks(self.color)
+            self._masks_ready = True
+        return self._masks
+
+    def _legal(self, moves: List[int]) -> List[int]:
+        """Legalitätsfilter mit den Masken der Stellung."""
+        return self.engine.move_generator.filter_legal_moves(moves, self.color,
+                                                             self._legality_masks())
+
+    def _split_tactical(self, moves: List[int]):
+        """
+        Teilt taktische Züge in gewinnende Schläge (nach MVV-LVA sortiert),
+        Umwandlungen (Dame zuerst) und verlierende Schläge.
+
+        Ein Schlag gilt als gewinnend, wenn das Opfer mindestens so viel wert
+        ist wie der Angreifer oder das Zielfeld nicht gedeckt ist.
+        """
+        engine = self.engine
+        board = engine.board
+        is_attacked = engine.move_generator.is_square_attacked
+        opponent = -self.color
+        good = []
+        promotions = []
+        bad = []
+
+        for move in moves:
+            promotion_code = (move >> PROMOTION_SHIFT) & PROMOTION_MASK
+            if promotion_code:
+                promotions.append((promotion_code, move))
+                continue
+            to_pos = (move >> TO_SHIFT) & SQUARE_MASK
+            attacker = PIECE_VALUES[abs(board[move & SQUARE_MASK])]
+            if move & FLAG_EN_PASSANT:
+                victim = PIECE_VALUES[PAWN]
+            else:
+                victim = PIECE_VALUES[abs(board[to_pos])]
+            score = 10 * victim - attacker
+            if victim >= attacker or not is_attacked(to_pos, opponent):
+                good.append((score, move))
+            else:
+                bad.append((score, move))
+
+        good.sort(reverse=True)
+        promotions.sort(reverse=True)
+        bad.sort(reverse=True)
+        return ([move for _, move in good], [move for _, move in promotions],
+                [move for _, move in bad])
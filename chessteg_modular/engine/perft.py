@@ -0,0 +1,163 @@
+"""
+Chessteg Perft Module
+Zählt die Blattknoten des legalen Zugbaums (Performance Test) - zur
+Überprüfung der Zuggenerierung gegen Referenzwerte und zur Messung der
+Generierungsgeschwindigkeit
+
+Aufruf:  python engine/perft.py Tiefe [--fen FEN] [--divide] [--hash]
+                                      [--processes N] [--bitboards]
+"""
+
+import sys
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Any
+
+sys.path.append(os.path.dirname(__file__))
+
+from move_encoding import move_from, move_to, move_promotion
+
+KNIGHT = 4
+BISHOP = 3
+ROOK = 5
+QUEEN = 9
+
+PROMOTION_LETTERS = {QUEEN: 'q', ROOK: 'r', BISHOP: 'b', KNIGHT: 'n'}
+
+# Transpositionstabelle je Worker-Prozess (bleibt über mehrere Wurzelzüge erhalten)
+_worker_table: Dict = {}
+
+
+def perft(engine, depth: int, table: Optional[Dict] = None) -> int:
+    """
+    Zählt die Blattknoten bis `depth` ab der aktuellen Stellung.
+
+    Args:
+        engine: ChesstegEngine
+        depth: Suchtiefe in Halbzügen
+        table: optionale Tabelle (Hash-Schlüssel, Tiefe) -> Knoten; bereits
+            gezählte Teilbäume (Zugumstellungen) werden nicht erneut durchlaufen
+    """
+    if depth <= 0:
+        return 1
+    if table is not None:
+        key = (engine.hash_key, depth)
+        cached = table.get(key)
+        if cached is not None:
+            return cached
+
+    color = 1 if engine.white_turn else -1
+    moves = engine.move_generator.generate_packed_moves(color)
+    if depth == 1:
+        # Bulk-Counting: generate_packed_moves liefert nur legale Züge
+        nodes = len(moves)
+    else:
+        nodes = 0
+        for move in moves:
+            engine.make_search_move(move)
+            nodes += perft(engine, depth - 1, table)
+            engine.undo_search_move()
+
+    if table is not None:
+        table[key] = nodes
+    return nodes
+
+
+def move_to_uci(engine, move: int) -> str:
+    """Gepackter Zug in Koordinatennotation (z.B. 'e2e4', 'e7e8q')."""
+    notation = (engine._position_to_notation(move_from(move)) +
+                engine._position_to_notation(move_to(move)))
+    promotion_piece = move_promotion(move)
+    if promotion_piece:
+        notation += PROMOTION_LETTERS[promotion_piece]
+    return notation
+
+
+def _divide_worker(job) -> int:
+    """Zählt den Teilbaum eines Wurzelzuges in einem Worker-Prozess."""
+    from core import ChesstegEngine
+
+    position, use_bitboards, move, depth, use_hash = job
+    engine = ChesstegEngine.from_position(position, use_bitboards=use_bitboards)
+    engine.make_search_move(move)
+    return perft(engine, depth - 1, _worker_table if use_hash else None)
+
+
+def divide(engine, depth: int, use_hash: bool = False, processes: int = 1) -> Dict[str, int]:
+    """
+    Knotenzahl je Wurzelzug (Perft Divide).
+
+    Args:
+        use_hash: Teilbäume über Zobrist-Schlüssel zwischenspeichern
+        processes: > 1 verteilt die Wurzelzüge auf einen Prozess-Pool; die
+            Stellung wird dafür mit encode_position übergeben
+    """
+    if depth <= 0:
+        return {}
+    color = 1 if engine.white_turn else -1
+    moves = engine.move_generator.generate_packed_moves(color)
+
+    if processes > 1 and depth > 1:
+        position = engine.encode_position()
+        use_bitboards = engine.bitboards is not None
+        jobs = [(position, use_bitboards, move, depth, use_hash) for move in moves]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            counts = list(pool.map(_divide_worker, jobs))
+    else:
+        table = {} if use_hash else None
+        counts = []
+        for move in moves:
+            engine.make_search_move(move)
+            counts.append(perft(engine, depth - 1, table))
+            engine.undo_search_move()
+
+    return {move_to_uci(engine, move): count for move, count in zip(moves, counts)}
+
+
+def run_perft(engine, depth: int, use_hash: bool = False, processes: int = 1) -> Dict[str, Any]:
+    """
+    Perft mit Zeitmessung.
+
+    Returns:
+        {'nodes', 'seconds', 'nps', 'divide'} - divide: Knoten je Wurzelzug
+    """
+    start = time.perf_counter()
+    if depth <= 0:
+        counts = {}
+        nodes = 1
+    else:
+        counts = divide(engine, depth, use_hash, processes)
+        nodes = sum(counts.values())
+    seconds = time.perf_counter() - start
+    return {
+        'nodes': nodes,
+        'seconds': seconds,
+        'nps': nodes / seconds if seconds > 0 else 0.0,
+        'divide': counts,
+    }
+
+
+if __name__ == "__main__":
+    from core import ChesstegEngine, START_FEN
+
+    parser = argparse.ArgumentParser(description="Chessteg Perft")
+    parser.add_argument('depth', type=int, help="Tiefe in Halbzügen")
+    parser.add_argument('--fen', default=START_FEN, help="Stellung (Standard: Grundstellung)")
+    parser.add_argument('--divide', action='store_true', help="Knoten je Wurzelzug ausgeben")
+    parser.add_argument('--hash', action='store_true', help="Teilbäume zwischenspeichern")
+    parser.add_argument('--processes', type=int, default=1, help="Worker-Prozesse für die Wurzelzüge")
+    parser.add_argument('--bitboards', action='store_true', help="Bitboard-Zuggenerierung verwenden")
+    args = parser.parse_args()
+
+    engine = ChesstegEngine(use_bitboards=args.bitboards)
+    engine.load_fen(args.fen, detect_game_end=False)
+    result = run_perft(engine, args.depth, args.hash, args.processes)
+
+    if args.divide:
+        for notation, count in sorted(result['divide'].items()):
+            print(f"{notation}: {count}")
+        print()
+    print(f"Tiefe {args.depth}: {result['nodes']} Knoten in {result['seconds']:.2f}s "
+          f"= {result['nps']:.0f} Knoten/s")
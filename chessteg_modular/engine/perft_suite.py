@@ -0,0 +1,244 @@
+"""
+Chessteg Perft Suite Module
+Referenzstellungen mit bekannten Perft-Werten und Regressionsprüfung
+
+Die Knotenzahlen werden über MoveGenerator.generate_moves (Diktionär-API,
+wie GUI und Regelprüfung) gezählt und mit den Referenzwerten verglichen.
+Die Knotenrate wird in einer JSON-Baseline festgehalten; der Lauf schlägt
+fehl, wenn eine Knotenzahl abweicht oder die Gesamt-Knotenrate um mehr als
+den Schwellwert unter die Baseline fällt. Die Baseline ist maschinenabhängig
+(nicht versioniert, siehe .gitignore) und wird nur mit --update-baseline
+geschrieben; ohne Baseline werden nur die Knotenzahlen geprüft.
+
+Aufruf:  python engine/perft_suite.py [--depth N] [--baseline DATEI]
+                                      [--threshold 0.2] [--update-baseline]
+Rückgabewert 0 = bestanden, 1 = Fehler
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from typing import Dict, List, Any, Optional
+
+sys.path.append(os.path.dirname(__file__))
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perft_baseline.json')
+DEFAULT_THRESHOLD = 0.2
+
+# =============================================================================
+# REFERENZSTELLUNGEN
+# =============================================================================
+# counts[i] = Perft-Wert für Tiefe i + 1; depth = Tiefe für den Regressionslauf
+PERFT_SUITE: List[Dict[str, Any]] = [
+    {'name': 'startpos', 'depth': 3,
+     'fen': "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+     'counts': (20, 400, 8902, 197281)},
+    {'name': 'kiwipete', 'depth': 3,
+     'fen': "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     'counts': (48, 2039, 97862, 4085603)},
+    {'name': 'endspiel_turm', 'depth': 4,
+     'fen': "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     'counts': (14, 191, 2812, 43238, 674624)},
+    {'name': 'umwandlung_rochade', 'depth': 3,
+     'fen': "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     'counts': (6, 264, 9467, 422333)},
+    {'name': 'schach_umwandlung', 'depth': 3,
+     'fen': "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     'counts': (44, 1486, 62379, 2103487)},
+    {'name': 'mittelspiel', 'depth': 2,
+     'fen': "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     'counts': (46, 2079, 89890)},
+    # Randfälle: en Passant
+    {'name': 'ep_illegal_fesselung', 'depth': 4,
+     'fen': "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1",
+     'counts': (18, 92, 1670, 10138, 185429, 1134888)},
+    {'name': 'ep_illegal_laeufer', 'depth': 4,
+     'fen': "8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1",
+     'counts': (13, 102, 1266, 10276, 135655, 1015133)},
+    {'name': 'ep_gibt_schach', 'depth': 4,
+     'fen': "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1",
+     'counts': (15, 126, 1928, 13931, 206379, 1440467)},
+    # Randfälle: Rochade
+    {'name': 'kurze_rochade_schach', 'depth': 4,
+     'fen': "5k2/8/8/8/8/8/8/4K2R w K - 0 1",
+     'counts': (15, 66, 1198, 6399, 120330, 661072)},
+    {'name': 'lange_rochade_schach', 'depth': 4,
+     'fen': "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1",
+     'counts': (16, 71, 1286, 7418, 141077, 803711)},
+    {'name': 'rochaderechte', 'depth': 3,
+     'fen': "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1",
+     'counts': (26, 1141, 27826, 1274206)},
+    {'name': 'rochade_verhindert', 'depth': 2,
+     'fen': "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1",
+     'counts': (44, 1494, 50509, 1720476)},
+    # Randfälle: Umwandlung, Schach, Matt und Patt
+    {'name': 'umwandlung_aus_schach', 'depth': 4,
+     'fen': "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1",
+     'counts': (11, 133, 1442, 19174, 266199, 3821001)},
+    {'name': 'abzugsschach', 'depth': 3,
+     'fen': "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1",
+     'counts': (29, 165, 5160, 31961, 1004658)},
+    {'name': 'umwandlung_mit_schach', 'depth': 5,
+     'fen': "4k3/1P6/8/8/8/8/K7/8 w - - 0 1",
+     'counts': (9, 40, 472, 2661, 38983, 217342)},
+    {'name': 'unterverwandlung_schach', 'depth': 5,
+     'fen': "8/P1k5/K7/8/8/8/8/8 w - - 0 1",
+     'counts': (6, 27, 273, 1329, 18135, 92683)},
+    {'name': 'selbst_patt', 'depth': 6,
+     'fen': "K1k5/8/P7/8/8/8/8/8 w - - 0 1",
+     'counts': (2, 6, 13, 63, 382, 2217)},
+    {'name': 'patt_und_matt', 'depth': 5,
+     'fen': "8/k1P5/8/1K6/8/8/8/8 w - - 0 1",
+     'counts': (10, 25, 268, 926, 10857, 43261, 567584)},
+    {'name': 'springer_dame', 'depth': 3,
+     'fen': "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1",
+     'counts': (37, 183, 6559, 23527)},
+    {'name': 'umwandlungen', 'depth': 3,
+     'fen': "n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1",
+     'counts': (24, 496, 9483, 182838)},
+]
+
+
+def perft_generate_moves(engine, depth: int) -> int:
+    """Perft über MoveGenerator.generate_moves (Zug-Diktionäre)."""
+    if depth <= 0:
+        return 1
+    color = 1 if engine.white_turn else -1
+    moves = engine.move_generator.generate_moves(color)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        engine.make_search_move(move)
+        nodes += perft_generate_moves(engine, depth - 1)
+        engine.undo_search_move()
+    return nodes
+
+
+def run_suite(max_depth: Optional[int] = None, use_bitboards: bool = False) -> Dict[str, Any]:
+    """
+    Zählt alle Stellungen der Suite bis zur jeweiligen Regressionstiefe
+    (höchstens max_depth bzw. die tiefste bekannte Referenz).
+
+    Returns:
+        {'config', 'positions': {Name: {depth, nodes, expected, seconds, nps}},
+         'failures': [Meldungen], 'nodes', 'seconds', 'nps'}
+    """
+    from core import ChesstegEngine
+
+    engine = ChesstegEngine(use_bitboards=use_bitboards)
+    positions = {}
+    failures = []
+    total_nodes = 0
+    total_seconds = 0.0
+
+    for entry in PERFT_SUITE:
+        if max_depth is None:
+            depth = entry['depth']
+        else:
+            depth = min(max_depth, len(entry['counts']))
+        expected = entry['counts'][depth - 1]
+
+        engine.load_fen(entry['fen'], detect_game_end=False)
+        start = time.perf_counter()
+        nodes = perft_generate_moves(engine, depth)
+        seconds = time.perf_counter() - start
+
+        if nodes != expected:
+            failures.append(f"{entry['name']}: Tiefe {depth} ergibt {nodes} Knoten, erwartet {expected}")
+        positions[entry['name']] = {
+            'depth': depth,
+            'nodes': nodes,
+            'expected': expected,
+            'seconds': seconds,
+            'nps': nodes / seconds if seconds > 0 else 0.0,
+        }
+        total_nodes += nodes
+        total_seconds += seconds
+
+    return {
+        'config': {'max_depth': max_depth, 'bitboards': use_bitboards},
+        'positions': positions,
+        'failures': failures,
+        'nodes': total_nodes,
+        'seconds': total_seconds,
+        'nps': total_nodes / total_seconds if total_seconds > 0 else 0.0,
+    }
+
+
+def check_throughput(result: Dict[str, Any], baseline: Dict[str, Any],
+                     threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Vergleicht die Gesamt-Knotenrate mit der Baseline. Einzelne Stellungen
+    laufen zu kurz für eine stabile Messung und werden nur ausgegeben.
+
+    Returns:
+        Liste der Fehlermeldungen (leer = keine Regression)
+    """
+    if baseline.get('config') != result['config']:
+        return [f"Baseline wurde mit anderen Einstellungen gemessen ({baseline.get('config')}), "
+                f"bitte mit --update-baseline neu anlegen"]
+    minimum = baseline['nps'] * (1.0 - threshold)
+    if result['nps'] < minimum:
+        return [f"Knotenrate {result['nps']:.0f}/s liegt mehr als {threshold:.0%} unter "
+                f"der Baseline {baseline['nps']:.0f}/s"]
+    return []
+
+
+def save_baseline(result: Dict[str, Any], path: str):
+    """Schreibt die Knotenraten eines Laufs als JSON-Baseline."""
+    baseline = {
+        'config': result['config'],
+        'nodes': result['nodes'],
+        'nps': round(result['nps']),
+        'positions': {name: round(data['nps']) for name, data in result['positions'].items()},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    """Liest eine JSON-Baseline (None, wenn die Datei fehlt)."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chessteg Perft-Referenzsuite")
+    parser.add_argument('--depth', type=int, default=None,
+                        help="Höchsttiefe statt der Regressionstiefe je Stellung")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="JSON-Baseline der Knotenraten")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="erlaubter Rückgang der Knotenrate (0.2 = 20%%)")
+    parser.add_argument('--update-baseline', action='store_true', help="Baseline neu schreiben")
+    parser.add_argument('--bitboards', action='store_true', help="Bitboard-Zuggenerierung verwenden")
+    args = parser.parse_args()
+
+    result = run_suite(args.depth, args.bitboards)
+
+    for name, data in result['positions'].items():
+        status = 'OK' if data['nodes'] == data['expected'] else 'FEHLER'
+        print(f"{name:26s} Tiefe {data['depth']}: {data['nodes']:9d} Knoten "
+              f"{data['nps']:9.0f}/s  {status}")
+    print(f"Gesamt: {result['nodes']} Knoten in {result['seconds']:.2f}s = {result['nps']:.0f} Knoten/s")
+
+    failures = list(result['failures'])
+    if not failures:
+        baseline = load_baseline(args.baseline)
+        if args.update_baseline:
+            save_baseline(result, args.baseline)
+            print(f"Baseline geschrieben: {args.baseline}")
+        elif baseline is None:
+            print(f"⚠️ Keine Baseline unter {args.baseline} - nur Knotenzahlen geprüft, "
+                  f"Knotenrate nicht (mit --update-baseline anlegen)")
+        else:
+            failures += check_throughput(result, baseline, args.threshold)
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,94 @@
+"""
+Chessteg Position Codec Module
+Kompakte Binärdarstellung fester Länge für die Übergabe von Stellungen
+zwischen Prozessen (parallele Suche, Stapelanalyse)
+
+Layout (POSITION_SIZE = 38 Bytes, Big Endian):
+    Bytes  0-31  Figuren, 4 Bit je Feld a1..h8 (zwei Felder pro Byte)
+                 0 = leer, 1-6 = weiß P N B R Q K, 9-14 = schwarz P N B R Q K
+    Byte     32  Bit 0: Schwarz am Zug, Bits 1-4: Rochaderechte (K Q k q)
+    Byte     33  En Passant Ziel als 10x12-Feld (0 = keines)
+    Bytes 34-35  Halbzugzähler
+    Bytes 36-37  Zugnummer
+"""
+
+import struct
+from typing import Dict, List, Optional, Tuple
+
+PAWN = 1
+KNIGHT = 4
+BISHOP = 3
+ROOK = 5
+QUEEN = 9
+KING = 99
+WHITE = 1
+BLACK = -1
+
+_HEADER = struct.Struct('>BBHH')
+POSITION_SIZE = 32 + _HEADER.size
+
+# Figurentyp <-> 4-Bit-Code (Schwarz: Code + 8)
+_TYPE_CODES = {PAWN: 1, KNIGHT: 2, BISHOP: 3, ROOK: 4, QUEEN: 5, KING: 6}
+_CODE_TYPES = {code: piece_type for piece_type, code in _TYPE_CODES.items()}
+_BLACK_BIT = 8
+
+CASTLING_ORDER = ('white_kingside', 'white_queenside', 'black_kingside', 'black_queenside')
+
+# Bit-Index 0-63 (a1 = 0) -> 10x12-Feld
+_SQUARES = [(sq // 8 + 2) * 10 + sq % 8 + 1 for sq in range(64)]
+
+Placement = List[Tuple[int, int, int]]  # (Figurentyp, Farbe, Position)
+
+
+def pack_position(square_index, white_turn: bool, castling_rights: Dict[str, bool],
+                  en_passant_target: Optional[int], halfmove_clock: int,
+                  fullmove_number: int) -> bytes:
+    """Packt eine Stellung in POSITION_SIZE Bytes."""
+    placement = bytearray(32)
+    for sq, position in enumerate(_SQUARES):
+        piece = square_index[position]
+        if piece is None:
+            continue
+        code = _TYPE_CODES[piece.type]
+        if piece.color == BLACK:
+            code |= _BLACK_BIT
+        placement[sq >> 1] |= code << (4 * (sq & 1))
+
+    flags = 0 if white_turn else 1
+    for bit, name in enumerate(CASTLING_ORDER, 1):
+        if castling_rights.get(name):
+            flags |= 1 << bit
+
+    return bytes(placement) + _HEADER.pack(flags, en_passant_target or 0,
+                                           min(halfmove_clock, 0xFFFF),
+                                           min(fullmove_number, 0xFFFF))
+
+
+def unpack_position(data: bytes) -> Tuple[Placement, bool, Dict[str, bool], Optional[int], int, int]:
+    """
+    Entpackt eine mit pack_position erzeugte Stellung.
+
+    Returns:
+        (Figuren, Weiß am Zug, Rochaderechte, en Passant Ziel, Halbzugzähler, Zugnummer)
+
+    Raises:
+        ValueError: bei falscher Länge oder ungültigem Figurencode
+    """
+    if len(data) != POSITION_SIZE:
+        raise ValueError(f"Stellung muss {POSITION_SIZE} Bytes lang sein, nicht {len(data)}")
+
+    placement = []
+    for sq, position in enumerate(_SQUARES):
+        code = (data[sq >> 1] >> (4 * (sq & 1))) & 0xF
+        if not code:
+            continue
+        piece_type = _CODE_TYPES.get(code & ~_BLACK_BIT)
+        if piece_type is None:
+            raise ValueError(f"Ungültiger Figurencode {code} auf Feld {position}")
+        placement.append((piece_type, BLACK if code & _BLACK_BIT else WHITE, position))
+
+    flags, en_passant_target, halfmove_clock, fullmove_number = _HEADER.unpack_from(data, 32)
+    castling_rights = {name: bool(flags & (1 << bit)) for bit, name in enumerate(CASTLING_ORDER, 1)}
+
+    return (placement, not flags & 1, castling_rights, en_passant_target or None,
+            halfmove_clock, fullmove_number)
@@ -3,7 +3,6 @@ Chessteg Rules Module - KORRIGIERTE VERSION
 Vollständige Implementierung spezieller Schachregeln
 """
 
-import copy
 from typing import Dict, Any, Optional, List, Tuple
 
 
@@ -67,6 +66,11 @@ class ChessRules:
         if not self._check_basic_castling_requirements(color, side):
             return False
         
+        # Felder zwischen König und Turm müssen frei sein
+        # (vor der Sicherheitsprüfung, da diese den König temporär versetzt)
+        if not self._check_castling_squares_empty(color, side):
+            return False
+        
         # König darf nicht im Schach stehen
         if self.engine.is_king_in_check(color):
             return False
@@ -75,10 +79,6 @@ class ChessRules:
         if not self._check_castling_squares_safety(color, side):
             return False
         
-        # Felder zwischen König und Turm müssen frei sein
-        if not self._check_castling_squares_empty(color, side):
-            return False
-        
         return True
     
     def execute_castling(self, color: int, side: str) -> bool:
@@ -99,28 +99,21 @@ class ChessRules:
         king_from, king_to, rook_from, rook_to = self._get_castling_positions(color, side)
         
         # König finden
-        king = next((p for p in self.engine.pieces 
-                    if p['type'] == 99 and p['color'] == color and not p['captured']), None)
+        king = self.engine.get_king(color)
         if not king:
             return False
         
         # Turm finden
-        rook = next((p for p in self.engine.pieces 
-                    if p['type'] == 5 and p['color'] == color and 
-                    p['position'] == rook_from and not p['captured']), None)
-        if not rook:
+        rook = self.engine.get_piece_at(rook_from)
+        if not rook or rook.type != 5 or rook.color != color:
             return False
         
         # Rochade ausführen
         # 1. König bewegen
-        self.engine.board[king_from] = 0  # EMPTY
-        self.engine.board[king_to] = 99 * color
-        king['position'] = king_to
+        self.engine._relocate_piece(king, king_to)
         
         # 2. Turm bewegen  
-        self.engine.board[rook_from] = 0  # EMPTY
-        self.engine.board[rook_to] = 5 * color
-        rook['position'] = rook_to
+        self.engine._relocate_piece(rook, rook_to)
         
         # Rochaderecht für diese Farbe aufheben
         self._revoke_castling_rights(color)
@@ -199,13 +192,10 @@ class ChessRules:
         # En Passant ausführen
         # 1. Bauer bewegen
         from_pos = pawn['position']
-        self.engine.board[from_pos] = 0  # EMPTY
-        self.engine.board[target_pos] = 1 * pawn['color']
-        pawn['position'] = target_pos
+        self.engine._relocate_piece(pawn, target_pos)
         
         # 2. Gegnerischen Bauer schlagen
-        self.engine.board[opponent_pawn_pos] = 0  # EMPTY
-        opponent_pawn['captured'] = True
+        self.engine._take_off_board(opponent_pawn)
         
         # En Passant Recht zurücksetzen
         self.en_passant_target = None
@@ -246,16 +236,8 @@ class ChessRules:
         # Umwandlung durchführen
         position = pawn['position']
         
-        # Alten Bauer entfernen
-        self.engine.pieces = [p for p in self.engine.pieces if p != pawn]
-        
-        # Neue Figur hinzufügen
-        self.engine.pieces.append({
-            'type': piece_type,
-            'color': pawn['color'],
-            'position': position,
-            'captured': False
-        })
+        # Bauer in die neue Figur umwandeln (ID und Index bleiben erhalten)
+        self.engine._promote_piece(pawn, piece_type)
         
         # Brett aktualisieren
         self.engine.board[position] = piece_type * pawn['color']
@@ -403,29 +385,21 @@ class ChessRules:
         # Temporär König bewegen und Felder prüfen
         original_pos = king_from
         king = self.engine.get_piece_at(king_from)
+        if not king:
+            return False
         
         for square in check_squares:
-            # Temporär König auf Feld bewegen
-            self.engine.board[original_pos] = 0
-            self.engine.board[square] = 99 * color
-            if king:
-                king['position'] = square
+            # Temporär König auf Feld bewegen (Board und Index bleiben konsistent)
+            self.engine._relocate_piece(king, square)
             
             # Prüfen ob König im Schach
-            if self.engine.is_king_in_check(color):
-                # Zustand zurücksetzen
-                self.engine.board[original_pos] = 99 * color
-                self.engine.board[square] = 0
-                if king:
-                    king['position'] = original_pos
-                return False
+            in_check = self.engine.is_king_in_check(color)
             
             # Zustand zurücksetzen
-            self.engine.board[original_pos] = 99 * color
-            self.engine.board[square] = 0
-        
-        if king:
-            king['position'] = original_pos
+            self.engine._relocate_piece(king, original_pos)
+            
+            if in_check:
+                return False
         
         return True
     
@@ -544,28 +518,22 @@ class ChessRules:
     def _validate_no_self_check_after_en_passant(self, pawn: Dict[str, Any], target_pos: int, 
                                                opponent_pawn_pos: int) -> bool:
         """Prüft ob en Passant keinen Selbstschach verursacht"""
-        # Zustand speichern
-        original_board = self.engine.board.copy()
-        original_pieces = copy.deepcopy(self.engine.pieces)
-        
         # Temporären en Passant ausführen
         from_pos = pawn['position']
-        self.engine.board[from_pos] = 0
-        self.engine.board[target_pos] = 1 * pawn['color']
-        pawn['position'] = target_pos
+        self.engine._relocate_piece(pawn, target_pos)
         
         # Gegnerischen Bauer schlagen
         opponent_pawn = self.engine.get_piece_at(opponent_pawn_pos)
         if opponent_pawn:
-            self.engine.board[opponent_pawn_pos] = 0
-            opponent_pawn['captured'] = True
+            self.engine._take_off_board(opponent_pawn)
         
         # Schach prüfen
         in_check = self.engine.is_king_in_check(pawn['color'])
         
-        # Zustand wiederherstellen
-        self.engine.board = original_board
-        self.engine.pieces = original_pieces
+        # Zustand inkrementell wiederherstellen
+        if opponent_pawn:
+            self.engine._put_on_board(opponent_pawn)
+        self.engine._relocate_piece(pawn, from_pos)
         
         return not in_check
     
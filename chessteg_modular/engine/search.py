@@ -8,6 +8,11 @@ import time
 import copy
 from typing import List, Dict, Any, Optional, Tuple
 
+from move_encoding import (move_from, move_to, move_promotion, move_to_dict, FLAG_CAPTURE,
+                           FLAG_EN_PASSANT, NO_MOVE)
+from move_picker import MovePicker, TACTICAL_FLAGS
+from transposition import TranspositionTable, BOUND_EXACT, BOUND_LOWER, BOUND_UPPER
+
 
 class SearchAlgorithm:
     """
@@ -17,6 +22,10 @@ class SearchAlgorithm:
     # Konstanten für Alpha-Beta
     MATE_SCORE = 20000000
     MAX_DEPTH = 30
+    HISTORY_MAX = 100000  # darüber wird die History-Tabelle halbiert
+    ASPIRATION_WINDOW = 110  # halbe Fensterbreite um den Score der Vortiefe (> 1 Bauer)
+    NULL_MOVE_REDUCTION = 2  # Tiefenreduktion R der Nullzug-Suche
+    NULL_MOVE_MIN_DEPTH = 3  # Nullzug erst ab dieser Resttiefe
 
     # Figuren-Typen und Werte
     PAWN = 1
@@ -41,35 +50,53 @@ class SearchAlgorithm:
         self.ai_settings = {
             'search_depth': 3,
             'extended_evaluation': True,
-            'quiescence_search': False,  # 🚨 KORREKTUR: Erstmal deaktivieren für Stabilität
+            'quiescence_search': True,  # nur Schläge/Umwandlungen (generate_tactical_moves)
             'quiescence_depth': 2,
-            'timeout_ms': 5000  # 🚨 KORREKTUR: Mehr Zeit für Debugging
+            'timeout_ms': 5000,  # 🚨 KORREKTUR: Mehr Zeit für Debugging
+            'tt_size_mb': 16  # Größe der Transpositionstabelle
         }
         
         # Suchstatistiken
         self.node_counter = 0
+        self.depth_nodes: List[Tuple[int, int]] = []  # (Tiefe, Knoten) je abgeschlossener Iteration
         self.move_counter = 0
         self.calculation_start_time = 0
-        self.transposition_table = {}
+        self.search_aborted = False  # Timeout: laufende Iteration ist ungültig
+        
+        # Transpositionstabelle (bleibt über mehrere computer_move-Aufrufe erhalten)
+        self.transposition_table = TranspositionTable(self.ai_settings['tt_size_mb'])
         
-        # Move Ordering Cache
-        self.move_ordering_cache = {}
+        # Move Ordering: zwei Killerzüge je Ply und History je Farbe
+        # (Index from * 120 + to), beide über Beta-Schnitte ruhiger Züge gepflegt
+        self.killer_moves = [[NO_MOVE, NO_MOVE] for _ in range(self.MAX_DEPTH + 1)]
+        self.history = {1: [0] * 14400, -1: [0] * 14400}
+        
+        # Beta-Schnitte und davon Schnitte beim ersten Zug (Güte des Move Ordering)
+        self.search_stats = {'beta_cutoffs': 0, 'first_move_cutoffs': 0, 'null_move_cutoffs': 0}
     
     def computer_move(self) -> Optional[Dict[str, Any]]:
         """
         Berechnet den besten Zug für den Computer mit vollständiger Alpha-Beta-Suche
+        und Iterative Deepening. Bei Timeout gilt das Ergebnis der letzten
+        vollständig abgeschlossenen Iteration.
         """
         print("=== KI MOVE CALCULATION STARTED ===")
         start_time = time.time()
         self.calculation_start_time = start_time
         self.node_counter = 0
         self.move_counter = 0
-        self.transposition_table = {}
+        self.search_aborted = False
+        self.depth_nodes = []
+        # Geänderte Tabellengröße (ai_settings['tt_size_mb']) -> neue Tabelle
+        if self.transposition_table.size_mb != self.ai_settings['tt_size_mb']:
+            self.transposition_table = TranspositionTable(self.ai_settings['tt_size_mb'])
+        self.transposition_table.new_search()
+        self._new_search_ordering()
         
         current_color = 1 if self.engine.white_turn else -1
         
-        # 1. Alle legalen Züge generieren
-        all_moves = self.engine.generate_all_moves(current_color)
+        # 1. Alle legalen Züge generieren (gepackte Integer-Züge)
+        all_moves = self.engine.move_generator.generate_packed_moves(current_color)
         if not all_moves:
             print("❌ Keine legalen Züge gefunden - Matt oder Patt?")
             print(f"Checkmate: {self.engine.checkmate}, Stalemate: {self.engine.stalemate}")
@@ -79,77 +106,139 @@ class SearchAlgorithm:
         print(f"🔍 {len(all_moves)} legale Züge verfügbar für {'Weiß' if current_color == 1 else 'Schwarz'}")
         
         # 2. Züge sortieren (Move Ordering)
-        sorted_moves = self._order_moves(all_moves)
+        root_moves = self._order_moves(all_moves)
         
-        best_move = None
-        best_score = -self.MATE_SCORE - 1
+        # Rückfallzug, falls schon Tiefe 1 nicht fertig wird
+        best_move = root_moves[0]
+        best_score = None
+        depth = 0
         
-        # 3. Iterative Deepening
-        depth = self.ai_settings['search_depth']
+        # 3. Iterative Deepening: Tiefe 1, 2, 3, ... bis search_depth oder Timeout
+        for iteration_depth in range(1, self.ai_settings['search_depth'] + 1):
+            result = self._search_aspiration(root_moves, iteration_depth, best_score)
+            if result is None:
+                print(f"⏰ Timeout in Tiefe {iteration_depth} - verwende Ergebnis der Tiefe {depth}")
+                break
+            
+            best_move, best_score = result
+            depth = iteration_depth
+            self.depth_nodes.append((depth, self.node_counter))
+            print(f"🎯 Tiefe {depth}: {self._move_to_notation(best_move)} mit Score {best_score} "
+                  f"({self.node_counter} Knoten, {time.time() - start_time:.2f}s)")
+            
+            # Bester Zug der Iteration wird in der nächsten zuerst untersucht
+            root_moves.remove(best_move)
+            root_moves.insert(0, best_move)
+
+        end_time = time.time()
+        duration = end_time - start_time
         
-        # 4. Alpha-Beta-Suche starten
-        alpha = -self.MATE_SCORE - 1
-        beta = self.MATE_SCORE + 1
+        print(f"=== KI MOVE CALCULATION FINISHED ===")
+        print(f"Best Score: {best_score}")
+        print(f"Best Move: {self._move_to_notation(best_move) if best_move else 'None'}")
+        print(f"Search Depth: {depth}")
+        print(f"Nodes Visited: {self.node_counter}")
+        print(f"Moves Evaluated: {self.move_counter}")
+        print(f"TT Hits: {self.transposition_table.hits}/{self.transposition_table.probes}")
+        print(f"Beta Cutoffs: {self.search_stats['beta_cutoffs']}, "
+              f"beim ersten Zug: {self.first_move_cutoff_rate():.1%}, "
+              f"Nullzug: {self.search_stats['null_move_cutoffs']}")
+        print(f"Calculation Time: {duration:.2f}s")
+        print(f"NPS: {self.node_counter / duration if duration > 0 else 0:.0f}")
+
+        if best_move:
+            print(f"✅ KI hat Zug gefunden: {self._move_to_notation(best_move)}")
+            # GUI und make_move erwarten das Zug-Diktionär
+            return move_to_dict(self.engine, best_move)
+
+        print("❌ KI konnte keinen Zug finden")
+        return None
+
+    def _search_aspiration(self, root_moves: List[int], depth: int,
+                           previous_score: Optional[int]) -> Optional[Tuple[int, int]]:
+        """
+        Wurzelsuche mit Aspiration Window um den Score der Vortiefe. Fällt
+        das Ergebnis aus dem Fenster, wird die betroffene Seite schrittweise
+        erweitert (zuletzt volles Fenster) und neu gesucht.
+        """
+        full_alpha = -self.MATE_SCORE - 1
+        full_beta = self.MATE_SCORE + 1
+        if previous_score is None or abs(previous_score) >= self.MATE_SCORE - self.MAX_DEPTH:
+            return self._search_root(root_moves, depth, full_alpha, full_beta)
         
-        print(f"🎯 Starte Alpha-Beta-Suche mit Tiefe {depth}, {len(sorted_moves)} Zügen")
+        delta = self.ASPIRATION_WINDOW
+        alpha = previous_score - delta
+        beta = previous_score + delta
+        while True:
+            result = self._search_root(root_moves, depth, alpha, beta)
+            if result is None:
+                return None
+            score = result[1]
+            if score <= alpha and alpha > full_alpha:
+                # Fail Low: untere Grenze erweitern
+                delta *= 4
+                alpha = max(score - delta, full_alpha)
+            elif score >= beta and beta < full_beta:
+                # Fail High: obere Grenze erweitern
+                delta *= 4
+                beta = min(score + delta, full_beta)
+            else:
+                return result
+            print(f"🔁 Aspiration Window Tiefe {depth}: neu mit [{alpha}, {beta}]")
+
+    def _search_root(self, root_moves: List[int], depth: int,
+                     alpha: int, beta: int) -> Optional[Tuple[int, int]]:
+        """
+        Eine Iteration der Wurzelsuche mit voller Tiefe `depth` im Fenster
+        [alpha, beta] (Principal Variation Search wie in _alpha_beta).
+
+        Returns:
+            (bester Zug, Score) oder None, wenn die Iteration durch das
+            Timeout abgebrochen wurde (ihre Scores sind dann ungültig)
+        """
+        best_move = None
+        best_score = -self.MATE_SCORE - 1
         
-        for i, move in enumerate(sorted_moves):
+        for move in root_moves:
             self.move_counter += 1
             
-            # Zug ausführen (transaktional)
-            if not self.engine.make_move(move):
-                print(f"❌ Zug {i+1}/{len(sorted_moves)}: {self._move_to_notation(move)} konnte nicht ausgeführt werden")
+            # Zug ausführen (Such-Modus ohne Spielende-Prüfung)
+            if not self.engine.make_search_move(move):
                 continue
             
-            # Rufe Alpha-Beta für die nächste Tiefe auf
-            score = -self._alpha_beta(depth - 1, -beta, -alpha)
+            if best_move is None:
+                score = -self._alpha_beta(depth - 1, -beta, -alpha, 1)
+            else:
+                score = -self._alpha_beta(depth - 1, -alpha - 1, -alpha, 1)
+                if alpha < score < beta:
+                    score = -self._alpha_beta(depth - 1, -beta, -alpha, 1)
             
-            # Zug rückgängig machen
-            self.engine.undo_move()
+            self.engine.undo_search_move()
             
-            print(f"🔍 Zug {i+1}/{len(sorted_moves)}: {self._move_to_notation(move)} -> Score: {score}")
+            # Nach einem Timeout liefert _alpha_beta nur Platzhalter-Scores
+            if self.search_aborted:
+                return None
             
-            # Timeout-Check
-            if self._check_timeout():
-                print(f"⏰ Timeout erreicht nach {self.move_counter} Zügen")
-                break
-                
-            # Alpha-Beta Update
-            if score > best_score:
+            if score > best_score or best_move is None:
                 best_score = score
                 best_move = move
-                print(f"🏆 NEUER BESTER ZUG: {self._move_to_notation(move)} mit Score {score}")
                 
             if score > alpha:
                 alpha = score
                 
-            # Beta-Cutoff
             if alpha >= beta:
-                print(f"✂️ Beta-Cutoff bei Zug {i+1}")
                 break
-
-        end_time = time.time()
-        duration = end_time - start_time
         
-        print(f"=== KI MOVE CALCULATION FINISHED ===")
-        print(f"Best Score: {best_score}")
-        print(f"Best Move: {self._move_to_notation(best_move) if best_move else 'None'}")
-        print(f"Search Depth: {depth}")
-        print(f"Nodes Visited: {self.node_counter}")
-        print(f"Moves Evaluated: {self.move_counter}")
-        print(f"Calculation Time: {duration:.2f}s")
-        print(f"NPS: {self.node_counter / duration if duration > 0 else 0:.0f}")
-
-        if best_move:
-            print(f"✅ KI hat Zug gefunden: {self._move_to_notation(best_move)}")
-        else:
-            print("❌ KI konnte keinen Zug finden")
-            
-        return best_move
+        if best_move is None:
+            return None
+        return best_move, best_score
 
-    def _alpha_beta(self, depth: int, alpha: int, beta: int) -> int:
+    def _alpha_beta(self, depth: int, alpha: int, beta: int, ply: int = 1,
+                    allow_null: bool = True) -> int:
         """
         Der rekursive Alpha-Beta-Suchalgorithmus.
+        ply: Abstand zur Wurzel (Index der Killerzüge)
+        allow_null: False direkt nach einem Nullzug (keine zwei Nullzüge in Folge)
         """
         self.node_counter += 1
         
@@ -157,49 +246,90 @@ class SearchAlgorithm:
         if self._check_timeout():
             return 0
         
-        # 1. Prüfe auf Spielende (Matt/Patt)
-        if self.engine.is_game_over():
-            score = self._mate_or_stalemate_score(depth)
-            # 🚨 DEBUG: Zeige Matt/Patt-Erkennung
-            if abs(score) > 1000000:
-                print(f"  🏁 Terminalstellung: Score {score} (Tiefe {depth})")
-            return score
+        current_color = 1 if self.engine.white_turn else -1
         
-        # 2. Basisfall: Tiefe erreicht
+        # 1. Basisfall: Tiefe erreicht
+        # make_search_move prüft kein Spielende mehr - Matt wird hier nur
+        # bei Schach gesucht, damit Blätter ohne Schach billig bleiben
         if depth <= 0:
-            score = self.engine.evaluator.evaluate_position()
+            if (self.engine.is_king_in_check(current_color) and
+                    not self.engine.move_generator.generate_packed_moves(current_color)):
+                return self._mate_or_stalemate_score(ply)
+            if self.ai_settings['quiescence_search']:
+                return self._quiescence(alpha, beta, self.ai_settings['quiescence_depth'])
+            score = self._evaluate(current_color)
             # 🚨 DEBUG: Zeige erste Bewertungen
             if self.node_counter < 10:
                 print(f"  📊 Blattevaluation: {score} (Tiefe {depth})")
             return score
             
-        # 3. Zuggenerierung
-        current_color = 1 if self.engine.white_turn else -1
-        all_moves = self.engine.generate_all_moves(current_color)
+        # 2. Transpositionstabelle: Schnitt bei ausreichender Tiefe, sonst Hash-Zug
+        key = self.engine.hash_key
+        hash_move = NO_MOVE
+        entry = self.transposition_table.probe(key)
+        if entry is not None:
+            hash_move, entry_depth, bound, entry_score = entry
+            entry_score = self._score_from_tt(entry_score, ply)
+            if entry_depth >= depth and (bound == BOUND_EXACT or
+                                         (bound == BOUND_LOWER and entry_score >= beta) or
+                                         (bound == BOUND_UPPER and entry_score <= alpha)):
+                return entry_score
         
-        if not all_moves:
-            score = self._mate_or_stalemate_score(depth)
-            print(f"  ❌ Keine Züge in Tiefe {depth}: Score {score}")
-            return score
-
-        # 4. Move Ordering
-        sorted_moves = self._order_moves(all_moves)
+        # 3. Nullzug-Pruning: Schlägt die Stellung selbst dann noch über Beta,
+        # wenn die Seite am Zug passt, wird der Knoten mit reduzierter Tiefe
+        # abgeschnitten. Nicht im Schach, nicht direkt nach einem Nullzug und
+        # nicht in reinen Bauernendspielen (Zugzwang: Passen wäre dort oft
+        # besser als jeder legale Zug)
+        if (allow_null and depth >= self.NULL_MOVE_MIN_DEPTH
+                and abs(beta) < self.MATE_SCORE - self.MAX_DEPTH
+                and self.engine.has_non_pawn_material(current_color)
+                and not self.engine.is_king_in_check(current_color)):
+            self.engine.make_null_move()
+            score = -self._alpha_beta(depth - 1 - self.NULL_MOVE_REDUCTION, -beta, -beta + 1,
+                                      ply + 1, False)
+            self.engine.undo_null_move()
+            if self.search_aborted:
+                return 0
+            if score >= beta:
+                self.search_stats['null_move_cutoffs'] += 1
+                return beta
+        
+        # 4. Stufenweise Zuggenerierung mit Move Ordering (MovePicker):
+        # Hash-Zug zuerst, ruhige Züge erst nach den Schlagzügen
+        killers = self.killer_moves[ply] if ply < len(self.killer_moves) else ()
+        picker = MovePicker(self.engine, current_color, hash_move, killers,
+                            self.history[current_color])
         
         # 5. Haupt-Alpha-Beta-Loop
+        original_alpha = alpha
         best_score = -self.MATE_SCORE - 1
+        best_move = NO_MOVE
+        legal_moves = 0
         
-        for move in sorted_moves:
+        for move in picker:
             # 🚨 DEBUG: Zeige ersten paar Züge
             if self.node_counter < 5 and depth == self.ai_settings['search_depth'] - 1:
                 print(f"    🔍 Prüfe Zug: {self._move_to_notation(move)} in Tiefe {depth}")
             
-            if not self.engine.make_move(move):
+            if not self.engine.make_search_move(move):
                 continue
+            legal_moves += 1
+            
+            # Rekursiver Aufruf (Principal Variation Search): der erste Zug mit
+            # vollem Fenster, alle weiteren mit Nullfenster - nur wenn einer
+            # davon Alpha überbietet, wird er mit vollem Fenster nachgesucht
+            if legal_moves == 1:
+                score = -self._alpha_beta(depth - 1, -beta, -alpha, ply + 1)
+            else:
+                score = -self._alpha_beta(depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < score < beta:
+                    score = -self._alpha_beta(depth - 1, -beta, -alpha, ply + 1)
             
-            # Rekursiver Aufruf
-            score = -self._alpha_beta(depth - 1, -beta, -alpha)
+            self.engine.undo_search_move()
             
-            self.engine.undo_move()
+            # Timeout: restliche Züge nicht mehr generieren und untersuchen
+            if self.search_aborted:
+                break
             
             # Alpha-Beta Update
             if score > best_score:
@@ -207,61 +337,206 @@ class SearchAlgorithm:
                 
             if score > alpha:
                 alpha = score
+                best_move = move
                 
             if alpha >= beta:
+                self._record_cutoff(move, current_color, depth, ply, legal_moves)
                 break
         
+        # Keine legalen Züge = Matt oder Patt
+        if legal_moves == 0:
+            score = self._mate_or_stalemate_score(ply)
+            print(f"  ❌ Keine Züge in Tiefe {depth}: Score {score}")
+            return score
+        
+        # Ergebnis speichern (nicht nach Timeout - die Scores sind dann ungültig)
+        if not self.search_aborted:
+            if best_score >= beta:
+                bound = BOUND_LOWER
+            elif best_score > original_alpha:
+                bound = BOUND_EXACT
+            else:
+                bound = BOUND_UPPER
+            self.transposition_table.store(key, best_move, depth, bound,
+                                           self._score_to_tt(best_score, ply))
+        
         return best_score
 
-    def _mate_or_stalemate_score(self, depth: int) -> int:
-        """Berechnet den Score bei Matt oder Patt - KORRIGIERTE VERSION"""
+    def _quiescence(self, alpha: int, beta: int, depth: int) -> int:
+        """
+        Quiescence Search: verfolgt nur Schlagzüge und Umwandlungen, bis die
+        Stellung ruhig ist. Der Generator erzeugt keine ruhigen Züge.
+        """
+        self.node_counter += 1
+        
+        if self._check_timeout():
+            return 0
+        
+        current_color = 1 if self.engine.white_turn else -1
+        
+        # Stand Pat: die Seite am Zug muss nicht schlagen
+        best_score = self._evaluate(current_color)
+        if depth <= 0 or best_score >= beta:
+            return best_score
+        if best_score > alpha:
+            alpha = best_score
+        
+        tactical_moves = self.engine.move_generator.generate_tactical_moves(current_color)
+        for move in self._order_moves(tactical_moves, quiescence=True):
+            if not self.engine.make_search_move(move):
+                continue
+            
+            score = -self._quiescence(-beta, -alpha, depth - 1)
+            
+            self.engine.undo_search_move()
+            
+            if self.search_aborted:
+                break
+            
+            if score > best_score:
+                best_score = score
+                
+            if score > alpha:
+                alpha = score
+                
+            if alpha >= beta:
+                break
+        
+        return best_score
+
+    def _evaluate(self, color: int) -> int:
+        """
+        Bewertung aus Sicht der Seite am Zug (Negamax).
+        evaluate_position liefert die Bewertung aus Sicht von Weiß.
+        """
+        return self.engine.evaluator.evaluate_position() * color
+
+    def _mate_or_stalemate_score(self, ply: int) -> int:
+        """
+        Berechnet den Score bei Matt oder Patt - KORRIGIERTE VERSION
+        ply: Abstand zur Wurzel - ein näheres Matt ist besser für den Gewinner
+        """
         current_color = 1 if self.engine.white_turn else -1
         
         # Prüfe auf Schach
         if self.engine.is_king_in_check(current_color):
             # Matt - sehr schlecht für den aktuellen Spieler
-            mate_score = -self.MATE_SCORE + (self.MAX_DEPTH - depth)
-            print(f"    ♟️  MATT erkannt! Score: {mate_score} (Tiefe {depth})")
+            mate_score = -self.MATE_SCORE + ply
+            print(f"    ♟️  MATT erkannt! Score: {mate_score} (Ply {ply})")
             return mate_score
         else:
             # Patt - Unentschieden
-            print(f"    🤝 PATT erkannt! Score: 0 (Tiefe {depth})")
+            print(f"    🤝 PATT erkannt! Score: 0 (Ply {ply})")
             return 0
 
+    def _score_to_tt(self, score: int, ply: int) -> int:
+        """
+        Mattscores zählen ab der Wurzel; in der Transpositionstabelle werden
+        sie als Abstand vom gespeicherten Knoten abgelegt, damit sie bei einer
+        anderen Wurzel oder einem anderen Ply gültig bleiben.
+        """
+        if score >= self.MATE_SCORE - self.MAX_DEPTH:
+            return score + ply
+        if score <= -self.MATE_SCORE + self.MAX_DEPTH:
+            return score - ply
+        return score
+
+    def _score_from_tt(self, score: int, ply: int) -> int:
+        """Gegenstück zu `_score_to_tt`: Mattabstand wieder ab der Wurzel."""
+        if score >= self.MATE_SCORE - self.MAX_DEPTH:
+            return score - ply
+        if score <= -self.MATE_SCORE + self.MAX_DEPTH:
+            return score + ply
+        return score
+
     def _check_timeout(self) -> bool:
-        """Prüft, ob das Timeout erreicht ist."""
+        """
+        Prüft, ob das Timeout erreicht ist. Einmal erreicht, bleibt die
+        Suche abgebrochen (search_aborted), bis computer_move neu startet.
+        """
+        if self.search_aborted:
+            return True
         if self.ai_settings['timeout_ms'] <= 0:
             return False
         
         elapsed_time_ms = (time.time() - self.calculation_start_time) * 1000
-        return elapsed_time_ms >= self.ai_settings['timeout_ms']
+        if elapsed_time_ms >= self.ai_settings['timeout_ms']:
+            self.search_aborted = True
+        return self.search_aborted
+
+    def _new_search_ordering(self):
+        """Killer und Statistik zurücksetzen, History nur abschwächen."""
+        for killers in self.killer_moves:
+            killers[0] = killers[1] = NO_MOVE
+        for table in self.history.values():
+            for index, value in enumerate(table):
+                if value:
+                    table[index] = value >> 1
+        self.search_stats['beta_cutoffs'] = 0
+        self.search_stats['first_move_cutoffs'] = 0
+        self.search_stats['null_move_cutoffs'] = 0
+
+    def _record_cutoff(self, move: int, color: int, depth: int, ply: int, move_number: int):
+        """Beta-Schnitt: Statistik, bei ruhigen Zügen Killer und History."""
+        self.search_stats['beta_cutoffs'] += 1
+        if move_number == 1:
+            self.search_stats['first_move_cutoffs'] += 1
+        
+        if move & TACTICAL_FLAGS:
+            return
+        
+        if ply < len(self.killer_moves):
+            killers = self.killer_moves[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        
+        table = self.history[color]
+        index = move_from(move) * 120 + move_to(move)
+        table[index] += depth * depth
+        if table[index] > self.HISTORY_MAX:
+            for history_table in self.history.values():
+                for i, value in enumerate(history_table):
+                    if value:
+                        history_table[i] = value >> 1
+
+    def first_move_cutoff_rate(self) -> float:
+        """Anteil der Beta-Schnitte, die schon beim ersten Zug eintraten."""
+        cutoffs = self.search_stats['beta_cutoffs']
+        return self.search_stats['first_move_cutoffs'] / cutoffs if cutoffs else 0.0
 
-    def _order_moves(self, moves: List[Dict[str, Any]], quiescence: bool = False) -> List[Dict[str, Any]]:
+    def _order_moves(self, moves: List[int], quiescence: bool = False) -> List[int]:
         """
-        Sortiert Züge für bessere Alpha-Beta-Performance.
+        Sortiert gepackte Züge für bessere Alpha-Beta-Performance.
         """
+        board = self.engine.board
+        piece_values = self.PIECE_VALUES
+        history = self.history[1 if self.engine.white_turn else -1]
         scored_moves = []
         for move in moves:
             score = 0
             
             # Schlagzüge priorisieren
-            if move.get('is_capture') or move.get('special_type') == 'en_passant':
+            if move & FLAG_CAPTURE or move & FLAG_EN_PASSANT:
                 # MVV-LVA Scoring
-                if move.get('special_type') == 'en_passant':
-                    victim_value = self.PIECE_VALUES[1]  # Bauer
+                if move & FLAG_EN_PASSANT:
+                    victim_value = piece_values[1]  # Bauer
                 else:
-                    victim = self.engine.get_piece_at(move['to_pos'])
-                    victim_value = self.PIECE_VALUES.get(victim['type'], 0) if victim else 0
+                    victim_value = piece_values.get(abs(board[move_to(move)]), 0)
                 
-                attacker_value = self.PIECE_VALUES.get(move['piece']['type'], 0)
+                attacker_value = piece_values.get(abs(board[move_from(move)]), 0)
                 score += 10 * victim_value - attacker_value
                 score += 10000  # Hoher Bonus für Schläge
                 
             # Umwandlungen priorisieren
-            elif move.get('promotion_piece'):
-                promotion_value = self.PIECE_VALUES.get(move['promotion_piece'], 0)
+            elif move_promotion(move):
+                promotion_value = piece_values.get(move_promotion(move), 0)
                 score += 900 + promotion_value
                 
+            # Ruhige Züge nach History (immer hinter Schlägen und Umwandlungen)
+            else:
+                score += history[move_from(move) * 120 + move_to(move)] - self.HISTORY_MAX
+                
             scored_moves.append((score, move))
             
         # Absteigend sortieren nach Score
@@ -269,16 +544,20 @@ class SearchAlgorithm:
         
         return [move for score, move in scored_moves]
 
-    def _get_move_key(self, move: Dict[str, Any]) -> Tuple[int, int, int]:
+    def _get_move_key(self, move) -> Tuple[int, int, int]:
         """Erzeugt einen eindeutigen Schlüssel für einen Zug."""
+        if isinstance(move, int):
+            return (move_from(move), move_to(move), move_promotion(move) or 0)
         promo = move.get('promotion_type', 0)
         return (move['from_pos'], move['to_pos'], promo)
     
-    def _move_to_notation(self, move: Dict[str, Any]) -> str:
-        """Konvertiert Zug zu algebraischer Notation"""
-        from_pos = self._position_to_notation(move['from_pos'])
-        to_pos = self._position_to_notation(move['to_pos'])
-        return f"{from_pos}{to_pos}"
+    def _move_to_notation(self, move) -> str:
+        """Konvertiert Zug (Diktionär oder gepackter Integer) zu algebraischer Notation"""
+        if isinstance(move, int):
+            from_pos, to_pos = move_from(move), move_to(move)
+        else:
+            from_pos, to_pos = move['from_pos'], move['to_pos']
+        return f"{self._position_to_notation(from_pos)}{self._position_to_notation(to_pos)}"
     
     def _position_to_notation(self, position: int) -> str:
         """Konvertiert interne Position zu algebraischer Notation"""
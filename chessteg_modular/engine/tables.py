@@ -0,0 +1,103 @@
+"""
+Chessteg Tables Module
+Vorberechnete Feldtabellen für das 10x12 Board (bei Import erzeugt)
+
+Alle Tabellen werden über die 10x12 Position indiziert und enthalten nur
+Felder des 8x8 Spielfeldes; Randfelder liefern leere Tupel. Generatoren,
+Angriffsprüfung und Bewertung iterieren damit über einfache Tupel ohne
+Randprüfung oder Richtungsarithmetik.
+"""
+
+from typing import Dict, Tuple
+
+PAWN = 1
+KNIGHT = 4
+BISHOP = 3
+ROOK = 5
+QUEEN = 9
+KING = 99
+WHITE = 1
+BLACK = -1
+
+Squares = Tuple[int, ...]
+
+# =============================================================================
+# GRUNDLAGEN
+# =============================================================================
+ON_BOARD: Tuple[bool, ...] = tuple(2 <= pos // 10 <= 9 and 1 <= pos % 10 <= 8
+                                   for pos in range(120))
+BOARD_SQUARES: Squares = tuple(pos for pos in range(120) if ON_BOARD[pos])
+
+ROOK_DIRECTIONS = (10, -10, 1, -1)      # N, S, E, W
+BISHOP_DIRECTIONS = (11, 9, -9, -11)    # NE, NW, SE, SW
+QUEEN_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+KNIGHT_OFFSETS = (21, 19, 12, 8, -8, -12, -19, -21)
+
+
+def _targets(pos: int, offsets) -> Squares:
+    """Alle Felder, die von pos aus mit einem Schritt erreichbar sind."""
+    if not ON_BOARD[pos]:
+        return ()
+    return tuple(pos + offset for offset in offsets
+                 if 0 <= pos + offset < 120 and ON_BOARD[pos + offset])
+
+
+def _ray(pos: int, direction: int) -> Squares:
+    """Felder eines Strahls ab (ausschließlich) pos, nächstes Feld zuerst."""
+    if not ON_BOARD[pos]:
+        return ()
+    squares = []
+    field = pos + direction
+    while ON_BOARD[field]:
+        squares.append(field)
+        field += direction
+    return tuple(squares)
+
+
+# =============================================================================
+# SPRUNG- UND SCHRITTFELDER
+# =============================================================================
+KNIGHT_TARGETS: Tuple[Squares, ...] = tuple(_targets(pos, KNIGHT_OFFSETS) for pos in range(120))
+KING_TARGETS: Tuple[Squares, ...] = tuple(_targets(pos, QUEEN_DIRECTIONS) for pos in range(120))
+
+# Schlagfelder eines Bauern der Farbe (Weiß zieht nach oben, +10)
+PAWN_CAPTURES: Dict[int, Tuple[Squares, ...]] = {
+    WHITE: tuple(_targets(pos, (11, 9)) for pos in range(120)),
+    BLACK: tuple(_targets(pos, (-9, -11)) for pos in range(120)),
+}
+
+# =============================================================================
+# STRAHLEN
+# =============================================================================
+# Richtung -> Strahl je Feld
+RAYS: Dict[int, Tuple[Squares, ...]] = {
+    direction: tuple(_ray(pos, direction) for pos in range(120))
+    for direction in QUEEN_DIRECTIONS
+}
+
+
+def _rays(directions) -> Tuple[Tuple[Squares, ...], ...]:
+    """Nicht-leere Strahlen je Feld in der Reihenfolge der Richtungen."""
+    return tuple(tuple(RAYS[d][pos] for d in directions if RAYS[d][pos])
+                 for pos in range(120))
+
+
+ROOK_RAYS = _rays(ROOK_DIRECTIONS)
+BISHOP_RAYS = _rays(BISHOP_DIRECTIONS)
+QUEEN_RAYS = _rays(QUEEN_DIRECTIONS)
+
+# Figurentyp -> Strahlen je Feld (nur gleitende Figuren)
+SLIDER_RAYS = {ROOK: ROOK_RAYS, BISHOP: BISHOP_RAYS, QUEEN: QUEEN_RAYS}
+
+# =============================================================================
+# KÖNIGSUMFELD (Bewertung)
+# =============================================================================
+# Königsfeld plus Nachbarfelder
+KING_ZONE: Tuple[Squares, ...] = tuple(((pos,) + KING_TARGETS[pos]) if ON_BOARD[pos] else ()
+                                       for pos in range(120))
+
+# Die (bis zu) drei Felder direkt vor dem König der Farbe
+PAWN_SHIELD: Dict[int, Tuple[Squares, ...]] = {
+    WHITE: tuple(_targets(pos, (9, 10, 11)) for pos in range(120)),
+    BLACK: tuple(_targets(pos, (-11, -10, -9)) for pos in range(120)),
+}
@@ -0,0 +1,121 @@
+"""
+Chessteg Transposition Table Module
+Transpositionstabelle fester Größe für die Alpha-Beta-Suche
+
+Jeder Eintrag belegt zwei 64-Bit-Wörter in einem array('Q'):
+    Wort 0  Zobrist-Schlüssel der Stellung
+    Wort 1  Bits  0-20  bester Zug (gepackt, move_encoding)
+            Bits 21-26  Resttiefe (0-63)
+            Bits 27-28  Schrankentyp (BOUND_EXACT, BOUND_LOWER, BOUND_UPPER)
+            Bits 29-34  Alter (Suchlauf-Zähler, 0-63)
+            Bits 35-63  Score + SCORE_OFFSET (29 Bit)
+
+Ersetzung: ein Eintrag wird überschrieben, wenn er leer ist, zur selben
+Stellung gehört, aus einem früheren Suchlauf stammt oder höchstens so
+tief gesucht wurde wie der neue.
+"""
+
+from array import array
+from typing import Optional, Tuple
+
+BOUND_EXACT = 1
+BOUND_LOWER = 2   # Score ist eine untere Schranke (Beta-Schnitt)
+BOUND_UPPER = 3   # Score ist eine obere Schranke (kein Zug über Alpha)
+
+ENTRY_SIZE = 16   # Bytes je Eintrag (zwei 64-Bit-Wörter)
+
+_MOVE_MASK = (1 << 21) - 1
+_DEPTH_SHIFT = 21
+_DEPTH_MASK = 0x3F
+_BOUND_SHIFT = 27
+_BOUND_MASK = 0x3
+_AGE_SHIFT = 29
+_AGE_MASK = 0x3F
+_SCORE_SHIFT = 35
+SCORE_OFFSET = 1 << 28
+
+
+class TranspositionTable:
+    """
+    Transpositionstabelle mit fester Speichergröße. Der Speicher wird erst
+    bei der ersten Suche (new_search) angelegt, damit Engines ohne Suche
+    (Perft-Worker, Analyse) keinen Speicher belegen.
+    """
+
+    def __init__(self, size_mb: int = 16):
+        self.size_mb = size_mb
+        # Anzahl der Einträge: größte Zweierpotenz, die in size_mb passt
+        entries = max(1, (size_mb << 20) // ENTRY_SIZE)
+        self.size = 1 << (entries.bit_length() - 1)
+        self.mask = self.size - 1
+        self.table: Optional[array] = None
+        self.age = 0
+
+        # Statistik
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        """Beginnt einen neuen Suchlauf: Alter erhöhen, Einträge bleiben erhalten."""
+        if self.table is None:
+            self.table = array('Q', bytes(self.size * ENTRY_SIZE))
+        self.age = (self.age + 1) & _AGE_MASK
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def clear(self):
+        """Verwirft alle Einträge."""
+        self.table = None
+        self.age = 0
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Sucht die Stellung mit dem Zobrist-Schlüssel `key`.
+
+        Returns:
+            (bester Zug, Resttiefe, Schrankentyp, Score) oder None
+        """
+        self.probes += 1
+        index = (key & self.mask) << 1
+        table = self.table
+        if table[index] != key:
+            return None
+        data = table[index + 1]
+        if not data:
+            return None
+        self.hits += 1
+        return (data & _MOVE_MASK,
+                (data >> _DEPTH_SHIFT) & _DEPTH_MASK,
+                (data >> _BOUND_SHIFT) & _BOUND_MASK,
+                (data >> _SCORE_SHIFT) - SCORE_OFFSET)
+
+    def store(self, key: int, move: int, depth: int, bound: int, score: int):
+        """Speichert ein Suchergebnis nach dem Ersetzungsschema."""
+        index = (key & self.mask) << 1
+        table = self.table
+        old = table[index + 1]
+        if (old and table[index] != key
+                and ((old >> _AGE_SHIFT) & _AGE_MASK) == self.age
+                and ((old >> _DEPTH_SHIFT) & _DEPTH_MASK) > depth):
+            # Tieferer Eintrag aus dem aktuellen Suchlauf bleibt erhalten
+            return
+        if not move and table[index] == key:
+            # Ohne neuen Zug den bekannten besten Zug behalten
+            move = old & _MOVE_MASK
+        self.stores += 1
+        table[index] = key
+        table[index + 1] = ((move & _MOVE_MASK)
+                            | (min(depth, _DEPTH_MASK) << _DEPTH_SHIFT)
+                            | (bound << _BOUND_SHIFT)
+                            | (self.age << _AGE_SHIFT)
+                            | ((score + SCORE_OFFSET) << _SCORE_SHIFT))
+
+    def usage(self) -> float:
+        """Anteil belegter Einträge (Stichprobe der ersten 1000)."""
+        if self.table is None:
+            return 0.0
+        sample = min(self.size, 1000)
+        used = sum(1 for i in range(sample) if self.table[2 * i + 1])
+        return used / sample
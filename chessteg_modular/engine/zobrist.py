@@ -0,0 +1,66 @@
+"""
+Chessteg Zobrist Module
+64-Bit Zobrist-Schlüssel für Stellungen (Figuren, Zugrecht, Rochade, en Passant)
+"""
+
+import random
+from typing import Dict, List
+
+# =============================================================================
+# SCHLÜSSEL-TABELLEN
+# =============================================================================
+# Fester Seed: gleiche Stellung -> gleicher Schlüssel, auch über Prozesse hinweg
+_rng = random.Random(0x43686573737465)
+
+
+def _random_key() -> int:
+    return _rng.getrandbits(64)
+
+
+# Figurenwert (z.B. 1, -1, 4, -99) -> Schlüssel je Feld des 10x12 Boards
+PIECE_KEYS: Dict[int, List[int]] = {}
+for _piece_type in (1, 3, 4, 5, 9, 99):
+    for _color in (1, -1):
+        PIECE_KEYS[_piece_type * _color] = [_random_key() for _ in range(120)]
+
+# Schwarz am Zug
+SIDE_KEY = _random_key()
+
+# Je ein Schlüssel pro Rochaderecht (Namen wie in ChessRules.castling_rights)
+CASTLING_KEYS: Dict[str, int] = {
+    name: _random_key()
+    for name in ('white_kingside', 'white_queenside', 'black_kingside', 'black_queenside')
+}
+
+# En Passant Linie (Index 1-8 = a-h, Index 0 und 9 ungenutzt)
+EN_PASSANT_KEYS: List[int] = [0] + [_random_key() for _ in range(8)] + [0]
+
+
+# =============================================================================
+# HILFSFUNKTIONEN
+# =============================================================================
+
+def castling_hash(castling_rights: Dict[str, bool]) -> int:
+    """Schlüsselanteil der aktuellen Rochaderechte."""
+    key = 0
+    for name, allowed in castling_rights.items():
+        if allowed:
+            key ^= CASTLING_KEYS[name]
+    return key
+
+
+def en_passant_hash(board: List[int], en_passant_target, white_turn: bool) -> int:
+    """
+    Schlüsselanteil des en Passant Ziels. Wie bei Polyglot zählt die Linie nur,
+    wenn ein Bauer der Partei am Zug tatsächlich schlagen könnte - sonst würden
+    identische Stellungen unterschiedliche Schlüssel erhalten.
+    """
+    if en_passant_target is None:
+        return 0
+    if white_turn:
+        pawn, pawn_pos = 1, en_passant_target - 10
+    else:
+        pawn, pawn_pos = -1, en_passant_target + 10
+    if board[pawn_pos - 1] == pawn or board[pawn_pos + 1] == pawn:
+        return EN_PASSANT_KEYS[en_passant_target % 10]
+    return 0
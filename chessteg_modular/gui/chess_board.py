@@ -296,8 +296,8 @@ class ChessBoard(tk.Frame):
     def _get_possible_moves_for_pos(self, from_pos):
         """Filtert legale Züge nach Startposition - KORRIGIERTE VERSION"""
         color = WHITE if self.engine.white_turn else BLACK
-        all_legal_moves = self.engine.generate_all_moves(color) 
-        moves_for_pos = [move for move in all_legal_moves if move['from_pos'] == from_pos]
+        # Zug-Cache der Engine: pro Stellung nur einmal generiert, nach Startfeld gruppiert
+        moves_for_pos = self.engine.legal_moves_from(from_pos, color)
         
         # 🚨 DEBUG: Zeige alle gefundenen Züge
         print(f"🔍 {len(moves_for_pos)} mögliche Züge für Position {self._position_to_notation(from_pos)}")